@@ -1,10 +1,13 @@
-from fastapi import UploadFile, File, Form
+from fastapi import UploadFile, File, Form, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from pathlib import Path
 from backend.ingestion.loaders import DocumentProcessor
 from backend.ingestion.chunkers import Chunker
 from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from backend.rag.orchestrator import RAGOrchestrator
+from backend.rag.answer_cache import AnswerCache
 from backend.feedback import FeedbackStore
 from backend.safety import (
     SafetyClassifier,
@@ -13,12 +16,23 @@ from backend.safety import (
     SafetyCategory
 )
 from backend.security import InfrastructureSecurityGuard
-from backend.document_security import DocumentVerifier, ThreatSeverity
+from backend.document_security import (
+    DocumentVerifier,
+    ThreatSeverity,
+    VerificationResult,
+    init_worker_verifier,
+    verify_in_worker
+)
 from backend.i18n import LanguageDetector, TranslationService
 from uuid import uuid4
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import os
 from typing import Optional
+from itertools import islice
+import asyncio
 import logging
+import hashlib
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,13 +43,19 @@ PROJECT_ID = os.getenv("PROJECT_ID", "mtech-stores-sre-monit-dev")
 app = FastAPI(
     title="Macy Rag Storebot",
     description="RAG-powered retail knowledge assistant API with Safety Framework and Document Verification",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 rag = RAGOrchestrator(project_id=PROJECT_ID)
+answer_cache = AnswerCache(ttl_seconds=float(os.getenv("ANSWER_CACHE_TTL", "3600")))
 feedback_store = FeedbackStore()
 
 # Initialize Safety Framework
-safety_classifier = SafetyClassifier(project_id=PROJECT_ID, use_llm_classification=True)
+safety_classifier = SafetyClassifier(
+    project_id=PROJECT_ID,
+    use_llm_classification=True,
+    llm_cache_path=os.getenv("SAFETY_LLM_CACHE_PATH", "./data/safety/llm_verdicts.sqlite")
+)
 safety_policy = SafetyPolicyEngine()
 safety_reporting = ConfidentialReportingService(project_id=PROJECT_ID)
 
@@ -45,11 +65,58 @@ infrastructure_guard = InfrastructureSecurityGuard()
 # Initialize Document Security
 document_verifier = DocumentVerifier(use_llm_verification=False, project_id=PROJECT_ID)
 
+# Verification is GIL-bound regex work, so it runs in worker processes.
+# "spawn" keeps workers from inheriting the loaded models and threads.
+verification_pool = ProcessPoolExecutor(
+    max_workers=int(os.getenv("INGEST_WORKERS", str(os.cpu_count() or 1))),
+    mp_context=multiprocessing.get_context("spawn"),
+    initializer=init_worker_verifier,
+    initargs=(document_verifier.use_llm_verification, document_verifier.project_id)
+)
+
+# Large PDFs are extracted page range by page range on the same workers
+document_processor = DocumentProcessor(executor=verification_pool)
+
 # Initialize i18n Services
 language_detector = LanguageDetector()
 translation_service = TranslationService()
 
+# Language display names resolved once; detector only ever returns these codes
+LANGUAGE_NAMES = {
+    code: translation_service.get_language_name(code)
+    for code in ("en", "es")
+}
+
+# Uploaded originals are kept here (created once at startup)
+RAW_DIR = Path("data/raw")
+
+# Copy buffer size for streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Max per-threat warnings echoed back in an /ingest response
+MAX_INGEST_WARNINGS = 50
+
+
+def _save_upload(file: UploadFile, save_path: Path) -> str:
+    """
+    Stream an upload to disk without holding the whole file in memory.
+
+    Returns:
+        SHA-256 hex digest of the uploaded bytes, computed in the same pass
+    """
+    digest = hashlib.sha256()
+    file.file.seek(0)
+    with open(save_path, "wb") as out:
+        while block := file.file.read(UPLOAD_CHUNK_SIZE):
+            digest.update(block)
+            out.write(block)
+    return digest.hexdigest()
+
+
 class Query(BaseModel):
+    # Request bodies are read-only once validated
+    model_config = ConfigDict(frozen=True)
+
     question: str
     store_id: str | None = None
     user_id: str | None = None  # For safety reporting
@@ -58,6 +125,8 @@ class Query(BaseModel):
     language: str | None = None  # Optional language override
 
 class FeedbackSubmission(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     question: str
     answer: str
     rating: int  # 1-5 stars
@@ -66,6 +135,26 @@ class FeedbackSubmission(BaseModel):
     store_id: Optional[str] = None
     session_id: Optional[str] = None
 
+@app.on_event("startup")
+def create_data_dirs():
+    """Create upload directory once instead of on every ingest"""
+    RAW_DIR.mkdir(parents=True, exist_ok=True)
+
+@app.on_event("startup")
+def warm_up_models():
+    """Run one embed at startup so the first request doesn't pay model warm-up"""
+    rag.embedder.embed(["warm up"])
+
+@app.on_event("shutdown")
+def shutdown_pools():
+    """Stop verification worker processes"""
+    verification_pool.shutdown(cancel_futures=True)
+
+@app.on_event("shutdown")
+def close_feedback_store():
+    """Close the feedback file handle"""
+    feedback_store.close()
+
 @app.get("/")
 def root():
     """Root endpoint"""
@@ -97,6 +186,68 @@ def health_check():
         }
     }
 
+async def _index_verified_document(
+    chunks: list[str],
+    real_name: str,
+    store_id: str,
+    verification_result: VerificationResult
+) -> dict:
+    """
+    Embed and index the chunks of a verified document.
+
+    Blocking steps run in the threadpool. The dense and sparse index
+    writes are independent, so they run concurrently.
+    """
+    # Keep vectors as a float32 array; Chroma stores float32 and accepts it
+    embeddings = await run_in_threadpool(rag.embedder.embed_array, chunks)
+
+    # Every chunk carries the same metadata; the stores only read it, so a
+    # single shared dict is referenced N times instead of copied N times
+    base_meta = {
+        "source": real_name,
+        "store_id": store_id,
+        "doc_type": "kb_article",
+        "verified": True,
+        "verification_hash": verification_result.document_hash,
+        "verified_at": verification_result.verified_at.isoformat()
+    }
+    metadatas = [base_meta] * len(chunks)
+
+    await asyncio.gather(
+        run_in_threadpool(rag.vector_store.add, chunks, embeddings, metadatas),
+        run_in_threadpool(rag.bm25.add, chunks, metadatas)
+    )
+
+    # New knowledge may change answers to previously cached questions
+    answer_cache.clear()
+    rag.semantic_cache.clear()
+
+    result = {
+        "status": "indexed",
+        "chunks": len(chunks),
+        "source": real_name,
+        "verification": {
+            "passed": True,
+            "severity": verification_result.overall_severity.value,
+            "document_hash": verification_result.document_hash
+        }
+    }
+
+    # Add warnings if any low/medium threats detected
+    threats = verification_result.threats_detected
+    if threats:
+        result["warnings"] = [
+            {
+                "category": t.category.value,
+                "severity": t.severity.value,
+                "recommendation": t.recommendation
+            }
+            for t in islice(threats, MAX_INGEST_WARNINGS)
+        ]
+        result["warnings_truncated"] = len(threats) > MAX_INGEST_WARNINGS
+
+    return result
+
 @app.post("/ingest")
 async def ingest_file(file: UploadFile = File(...), store_id: str = Form(...)):
     """
@@ -109,24 +260,27 @@ async def ingest_file(file: UploadFile = File(...), store_id: str = Form(...)):
 
     Only verified documents are chunked, embedded, and stored.
     """
-    raw_dir = Path("data/raw")
-    raw_dir.mkdir(parents=True, exist_ok=True)
-
-    real_name = file.filename
+    real_name = Path(file.filename or "upload").name
     suffix = Path(real_name).suffix
-    save_path = raw_dir / f"{uuid4().hex}{suffix}"
+    save_path = RAW_DIR / f"{uuid4().hex}{suffix}"
 
-    content = await file.read()
-    save_path.write_bytes(content)
+    # Stream upload to disk in a worker thread (no full in-memory copy)
+    upload_hash = await run_in_threadpool(_save_upload, file, save_path)
 
     try:
         # STEP 1: Extract text from document
-        processor = DocumentProcessor(save_path)
-        text = list(processor.document_dict.values())[0]
+        documents = await run_in_threadpool(document_processor.process, save_path)
+        text = next(iter(documents.values()), None)
+        if text is None:
+            raise ValueError(f"No text could be extracted from {real_name}")
 
         # STEP 2: SECURITY GATE - Document Verification
+        # fail_fast: a CRITICAL finding already decides the block, so the
+        # remaining categories are not scanned
         logger.info(f"Verifying document: {real_name}")
-        verification_result = document_verifier.verify_document(text, real_name)
+        verification_result = await asyncio.get_running_loop().run_in_executor(
+            verification_pool, verify_in_worker, text, real_name, upload_hash, True
+        )
 
         # STEP 3: Check verification result
         if not verification_result.allow_ingestion:
@@ -165,51 +319,26 @@ async def ingest_file(file: UploadFile = File(...), store_id: str = Form(...)):
         # STEP 5: Proceed with ingestion if verified safe
         logger.info(f"Document verified safe: {real_name}")
 
-        chunks = rag.chunker.semantic_chunker(text)
-        embeddings = rag.embedder.embed(chunks)
-
-        metadatas = [{
-            "source": real_name,
-            "store_id": store_id,
-            "doc_type": "kb_article",
-            "verified": True,
-            "verification_hash": verification_result.document_hash,
-            "verified_at": verification_result.verified_at.isoformat()
-        } for _ in chunks]
-
-        rag.vector_store.add(chunks, embeddings, metadatas)
-        rag.bm25.add(chunks, metadatas)
-
-        result = {
-            "status": "indexed",
-            "chunks": len(chunks),
-            "source": real_name,
-            "verification": {
-                "passed": True,
-                "severity": verification_result.overall_severity.value,
-                "document_hash": verification_result.document_hash
-            }
-        }
-
-        # Add warnings if any low/medium threats detected
-        if verification_result.threats_detected:
-            result["warnings"] = [
-                {
-                    "category": t.category.value,
-                    "severity": t.severity.value,
-                    "recommendation": t.recommendation
-                }
-                for t in verification_result.threats_detected
-            ]
-
-        return result
+        # Semantic chunking embeds every sentence, so it only runs once the
+        # document is allowed in; a running threadpool job can't be cancelled
+        chunks = await run_in_threadpool(rag.chunker.semantic_chunker, text)
+        return await _index_verified_document(
+            chunks, real_name, store_id, verification_result
+        )
 
     except Exception as e:
         logger.error(f"Error processing document {real_name}: {str(e)}")
         raise
 
+def _submit_safety_report(**report) -> None:
+    """Background task wrapper so a failed escalation is logged, not lost"""
+    try:
+        safety_reporting.submit_report(**report)
+    except Exception as e:
+        logger.error(f"Failed to submit safety report {report.get('report_id')}: {str(e)}")
+
 @app.post("/ask")
-def ask_question(query: Query):
+def ask_question(query: Query, background_tasks: BackgroundTasks):
     """
     Ask a question to the RAG system with integrated safety, security, and i18n.
 
@@ -252,7 +381,7 @@ def ask_question(query: Query):
             "safety_classification": "safe_operational",
             "is_safety_response": False,
             "language": detected_language,
-            "language_name": translation_service.get_language_name(detected_language)
+            "language_name": LANGUAGE_NAMES[detected_language]
         }
 
     # STEP 1: Safety Classification
@@ -273,8 +402,12 @@ def ask_question(query: Query):
 
         # STEP 3: Escalate if needed
         if safety_response.requires_escalation:
-            # Submit confidential report
-            report_id = safety_reporting.submit_report(
+            # Submit confidential report after the response is sent; the
+            # associate only needs the reference ID, not the storage round trip
+            report_id = safety_reporting.generate_report_id()
+            background_tasks.add_task(
+                _submit_safety_report,
+                report_id=report_id,
                 user_id=query.user_id or "anonymous",
                 message=query.question,
                 classification={
@@ -305,18 +438,25 @@ def ask_question(query: Query):
             "allow_continuation": safety_response.allow_continuation,
             "is_safety_response": True,
             "language": detected_language,
-            "language_name": translation_service.get_language_name(detected_language)
+            "language_name": LANGUAGE_NAMES[detected_language]
         }
 
     # STEP 4: If safe, proceed with normal RAG processing
     # Only questions classified as SAFE_OPERATIONAL reach this point
-    rag_response = rag.ask(query.question)
+    cache_key = AnswerCache.make_key(query.question, query.store_id, detected_language)
+    rag_response = answer_cache.get(cache_key)
+    if rag_response is None:
+        rag_response = rag.ask(query.question, query.store_id, detected_language)
+        # Internal flag, not part of the API. Don't keep serving a transient
+        # Vertex timeout/error for the TTL
+        if not rag_response.pop("generation_failed"):
+            answer_cache.put(cache_key, rag_response)
 
     # Add safety metadata and language to response
     rag_response["safety_classification"] = "safe_operational"
     rag_response["is_safety_response"] = False
     rag_response["language"] = detected_language
-    rag_response["language_name"] = translation_service.get_language_name(detected_language)
+    rag_response["language_name"] = LANGUAGE_NAMES[detected_language]
 
     return rag_response
 
@@ -13,12 +13,16 @@ from .document_verifier import (
     DocumentVerifier,
     VerificationResult,
     ThreatCategory,
-    ThreatSeverity
+    ThreatSeverity,
+    init_worker_verifier,
+    verify_in_worker
 )
 
 __all__ = [
     'DocumentVerifier',
     'VerificationResult',
     'ThreatCategory',
-    'ThreatSeverity'
+    'ThreatSeverity',
+    'init_worker_verifier',
+    'verify_in_worker'
 ]
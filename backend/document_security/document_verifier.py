@@ -6,10 +6,20 @@ Detects and blocks malicious content, prompt injection, social engineering, and
 """
 
 from enum import Enum
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass
+from collections import OrderedDict
+import hashlib
 import re
+import threading
+from re import _constants as sre_constants, _parser as sre_parser
 from datetime import datetime
+from itertools import islice
+
+try:
+    import hyperscan  # Optional: SIMD multi-pattern prefilter
+except ImportError:
+    hyperscan = None
 
 
 class ThreatCategory(Enum):
@@ -26,15 +36,25 @@ class ThreatCategory(Enum):
 
 
 class ThreatSeverity(Enum):
-    """Severity levels for detected threats"""
+    """Severity levels for detected threats, in increasing order"""
     NONE = "none"
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
     CRITICAL = "critical"
 
+    @property
+    def rank(self) -> int:
+        """Position in the severity order (NONE is 0), for plain int compares"""
+        return _SEVERITY_RANK[self]
+
+
+# Integer rank per severity (values stay strings: they are part of the API
+# responses)
+_SEVERITY_RANK = {severity: rank for rank, severity in enumerate(ThreatSeverity)}
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ThreatDetection:
     """Details of a detected threat"""
     category: ThreatCategory
@@ -45,7 +65,7 @@ class ThreatDetection:
     recommendation: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VerificationResult:
     """Result of document verification"""
     is_safe: bool
@@ -57,6 +77,155 @@ class VerificationResult:
     allow_ingestion: bool
 
 
+def _literal_keys(parsed) -> Optional[Set[str]]:
+    """
+    Find literal strings of which every match of a parsed pattern must contain
+    at least one. Returns None when no such set can be derived.
+    """
+    candidates: List[Set[str]] = []
+    run: List[str] = []
+
+    def flush():
+        if run:
+            candidates.append({"".join(run)})
+            run.clear()
+
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+
+        flush()
+        if op is sre_constants.SUBPATTERN:
+            keys = _literal_keys(av[-1])
+        elif op is sre_constants.BRANCH:
+            branch_keys = [_literal_keys(branch) for branch in av[1]]
+            keys = set().union(*branch_keys) if all(branch_keys) else None
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            keys = _literal_keys(av[2])
+        else:
+            keys = None
+        if keys:
+            candidates.append(keys)
+    flush()
+
+    if not candidates:
+        return None
+
+    # Prefer the set whose shortest key is longest (fewest false positives)
+    return max(candidates, key=lambda keys: min(len(k) for k in keys))
+
+
+# One shared recommendation per category (every detection references it)
+_RECOMMENDATIONS = {
+    ThreatCategory.PROMPT_INJECTION: "Block document. Contains prompt injection attempt.",
+    ThreatCategory.SOCIAL_ENGINEERING: "Review document. Contains social engineering indicators.",
+    ThreatCategory.CYBERSECURITY_THREAT: "Block document. Contains cybersecurity threat indicators.",
+    ThreatCategory.MALWARE_INDICATORS: "Block document. Contains malware indicators.",
+    ThreatCategory.PII_EXPOSURE: "Review document. May contain PII that should not be indexed.",
+    ThreatCategory.OFFENSIVE_CONTENT: "Review document. May contain inappropriate content.",
+    ThreatCategory.POLICY_VIOLATION: "Review document for policy compliance.",
+}
+
+
+def _social_engineering_severity(pattern: str) -> ThreatSeverity:
+    """Credential requests are critical, urgency is high, the rest medium"""
+    if 'credential' in pattern or 'password' in pattern:
+        return ThreatSeverity.CRITICAL
+    if 'urgent' in pattern or 'immediate' in pattern:
+        return ThreatSeverity.HIGH
+    return ThreatSeverity.MEDIUM
+
+
+@dataclass(slots=True, frozen=True)
+class _CategoryScan:
+    """One threat category's patterns and how their matches are reported"""
+    category: ThreatCategory
+    patterns: List[str]
+    # Alternation of all patterns, for text the literal prefilter can't handle
+    gate: re.Pattern
+    severity: ThreatSeverity
+    confidence: float
+    # Per-pattern severity, overriding `severity`
+    severity_for: Optional[Callable[[str], ThreatSeverity]] = None
+    # Mask SSNs and card numbers in the reported context
+    mask_pii: bool = False
+
+
+# Summary for documents with no detected threats (the common case)
+_CLEAN_SUMMARY = "Document passed all security checks. Safe for ingestion."
+
+# Whitespace matched by Unicode-mode \s but not by ASCII-mode \s or Hyperscan
+_UNICODE_ONLY_SPACES = '\x1c\x1d\x1e\x1f'
+
+# PII masking for extracted context
+_DIGIT_RUN = re.compile(r'\d{3}')
+_SSN_MASK = re.compile(r'\d{3}-\d{2}-\d{4}')
+_CARD_MASK = re.compile(r'\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}')
+
+# Undashed SSN. On plain ASCII text this is matched by _exact_digit_runs,
+# which finds the same spans without trying the regex at every position
+_SSN_DIGITS = r'\b\d{9}\b'
+
+# Byte classes for _exact_digit_runs: digit '0', other word char 'w', else ' '
+_DIGIT_CLASS_TABLE = bytes(
+    0x30 if chr(b).isdigit() else 0x77 if (chr(b).isalpha() or b == 0x5F) else 0x20
+    for b in range(128)
+) + b' ' * 128
+
+
+def _exact_digit_runs(content: str, length: int) -> Iterator[Tuple[int, int]]:
+    r"""
+    Spans of runs of exactly `length` digits bounded by non-word characters,
+    i.e. the matches of \b\d{length}\b in ASCII `content`.
+    """
+    classes = content.encode('ascii').translate(_DIGIT_CLASS_TABLE)
+    needle = b'0' * length
+    start = classes.find(needle)
+    while start != -1:
+        end = start + length
+        while end < len(classes) and classes[end] == 0x30:
+            end += 1
+        if (
+            end - start == length
+            and (start == 0 or classes[start - 1] == 0x20)
+            and (end == len(classes) or classes[end] == 0x20)
+        ):
+            yield start, end
+        start = classes.find(needle, end)
+
+
+# Characters hashed per update; bounds the transient UTF-8 copy
+_HASH_CHUNK_CHARS = 1 << 16
+
+
+def _content_sha256(content: str) -> str:
+    """SHA-256 hex digest of content's UTF-8 encoding, encoded in slices"""
+    digest = hashlib.sha256()
+    for start in range(0, len(content), _HASH_CHUNK_CHARS):
+        digest.update(content[start:start + _HASH_CHUNK_CHARS].encode())
+    return digest.hexdigest()
+
+
+def required_literals(pattern: str) -> Optional[tuple]:
+    """
+    Lower-cased literals of which any case-insensitive match of `pattern`
+    must contain one, or None if the pattern has no usable literal.
+
+    Used as a substring prefilter: `str.__contains__` is far cheaper than a
+    case-insensitive regex pass, and if none of the literals occur in the
+    lower-cased (ASCII) text the pattern cannot match.
+    """
+    try:
+        keys = _literal_keys(sre_parser.parse(pattern))
+    except Exception:
+        return None
+
+    if not keys or min(len(k) for k in keys) < 2:
+        return None
+    return tuple(sorted({k.lower() for k in keys}))
+
+
 class DocumentVerifier:
     """
     Comprehensive document security verifier.
@@ -69,16 +238,30 @@ class DocumentVerifier:
     - Offensive content and policy breaches
     """
 
-    def __init__(self, use_llm_verification: bool = False, project_id: Optional[str] = None):
+    def __init__(
+        self,
+        use_llm_verification: bool = False,
+        project_id: Optional[str] = None,
+        max_matches_per_pattern: Optional[int] = 10,
+        cache_size: int = 500
+    ):
         """
         Initialize document verifier.
 
         Args:
             use_llm_verification: Whether to use LLM for semantic threat detection
             project_id: GCP project ID for Vertex AI (if using LLM verification)
+            max_matches_per_pattern: Detections reported per pattern; further
+                matches cannot change the verdict (None for no limit)
+            cache_size: Max number of results kept in the LRU cache, keyed by
+                document hash (0 disables)
         """
         self.use_llm_verification = use_llm_verification
         self.project_id = project_id
+        self.max_matches_per_pattern = max_matches_per_pattern
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple, VerificationResult] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
         # Initialize threat pattern databases
         self._init_prompt_injection_patterns()
@@ -89,6 +272,167 @@ class DocumentVerifier:
         self._init_offensive_content_patterns()
         self._init_policy_violation_patterns()
 
+        # Compile every pattern once; scans look them up by source string
+        self._compiled_patterns: Dict[str, re.Pattern] = {
+            pattern: re.compile(pattern, re.IGNORECASE | re.DOTALL)
+            for pattern in self.prompt_injection_patterns
+        }
+        for patterns in (
+            self.social_engineering_patterns,
+            self.cybersecurity_patterns,
+            self.malware_patterns,
+            self.pii_patterns,
+            self.offensive_content_patterns,
+            self.policy_violation_patterns,
+        ):
+            for pattern in patterns:
+                self._compiled_patterns.setdefault(pattern, re.compile(pattern, re.IGNORECASE))
+
+        # ASCII-mode twins: same matches on plain ASCII text, but case folding
+        # and character classes skip the Unicode tables
+        self._ascii_patterns: Dict[str, re.Pattern] = {
+            pattern: re.compile(pattern, (regex.flags & ~re.UNICODE) | re.ASCII)
+            for pattern, regex in self._compiled_patterns.items()
+        }
+
+        # Category scans in run order (the CRITICAL-capable ones first). They
+        # run sequentially: re holds the GIL while matching, so threads would
+        # not overlap them; whole documents are parallelized across processes
+        # instead (see verify_in_worker).
+        # Each category's gate is one alternation: a single scan tells whether
+        # any of its patterns can match, so clean categories skip the
+        # per-pattern passes entirely. Gates are used for non-ASCII text, where
+        # the shared prefilter below doesn't apply (for ASCII text they would
+        # only repeat the work of the patterns that pass the prefilter)
+        gate = self._compile_gate
+        self._scans = (
+            _CategoryScan(
+                ThreatCategory.PROMPT_INJECTION, self.prompt_injection_patterns,
+                gate(self.prompt_injection_patterns, re.IGNORECASE | re.DOTALL),
+                severity=ThreatSeverity.CRITICAL, confidence=0.95
+            ),
+            _CategoryScan(
+                ThreatCategory.SOCIAL_ENGINEERING, self.social_engineering_patterns,
+                gate(self.social_engineering_patterns),
+                severity=ThreatSeverity.MEDIUM, confidence=0.85,
+                severity_for=_social_engineering_severity
+            ),
+            _CategoryScan(
+                ThreatCategory.CYBERSECURITY_THREAT, self.cybersecurity_patterns,
+                gate(self.cybersecurity_patterns),
+                severity=ThreatSeverity.CRITICAL, confidence=0.90
+            ),
+            _CategoryScan(
+                ThreatCategory.MALWARE_INDICATORS, self.malware_patterns,
+                gate(self.malware_patterns),
+                severity=ThreatSeverity.HIGH, confidence=0.80
+            ),
+            _CategoryScan(
+                ThreatCategory.PII_EXPOSURE, self.pii_patterns,
+                gate(self.pii_patterns),
+                severity=ThreatSeverity.HIGH, confidence=0.75, mask_pii=True
+            ),
+            _CategoryScan(
+                ThreatCategory.OFFENSIVE_CONTENT, self.offensive_content_patterns,
+                gate(self.offensive_content_patterns),
+                severity=ThreatSeverity.MEDIUM, confidence=0.70
+            ),
+            _CategoryScan(
+                ThreatCategory.POLICY_VIOLATION, self.policy_violation_patterns,
+                gate(self.policy_violation_patterns),
+                severity=ThreatSeverity.MEDIUM, confidence=0.65
+            ),
+        )
+
+        # Literal prefilter: per pattern, substrings one of which must occur
+        self._literal_keys = {
+            pattern: required_literals(pattern)
+            for patterns in (
+                self.prompt_injection_patterns,
+                self.social_engineering_patterns,
+                self.cybersecurity_patterns,
+                self.malware_patterns,
+                self.pii_patterns,
+                self.offensive_content_patterns,
+                self.policy_violation_patterns,
+            )
+            for pattern in patterns
+        }
+        self._all_literal_keys = {
+            key for keys in self._literal_keys.values() if keys for key in keys
+        }
+
+        # Optional Hyperscan database over every pattern: one SIMD pass reports
+        # which patterns can match at all (None when hyperscan is unavailable)
+        self._hs_patterns, self._hs_db = self._compile_hyperscan()
+        self._hs_local = threading.local()
+
+    def _compile_hyperscan(self):
+        """Compile all patterns into one Hyperscan prefilter database"""
+        if hyperscan is None:
+            return [], None
+
+        patterns = list(self._literal_keys)
+        dotall = set(self.prompt_injection_patterns)
+        base_flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_PREFILTER
+
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[pattern.encode() for pattern in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[
+                    base_flags | (hyperscan.HS_FLAG_DOTALL if pattern in dotall else 0)
+                    for pattern in patterns
+                ]
+            )
+        except Exception:
+            return [], None
+
+        return patterns, database
+
+    def _hyperscan_candidates(self, content: str) -> Optional[Set[str]]:
+        """
+        Patterns that may match `content`, or None if hyperscan is unavailable.
+        `content` must be ASCII without _UNICODE_ONLY_SPACES.
+        """
+        if self._hs_db is None:
+            return None
+
+        matched: Set[int] = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            matched.add(pattern_id)
+
+        # Scratch space is per thread (a scan must not share it) and reused,
+        # since allocating it costs more than scanning a short document
+        scratch = getattr(self._hs_local, "scratch", None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_db)
+
+        self._hs_db.scan(content.encode(), match_event_handler=on_match, scratch=scratch)
+        return {self._hs_patterns[pattern_id] for pattern_id in matched}
+
+    @staticmethod
+    def _compile_gate(patterns: List[str], flags: int = re.IGNORECASE) -> re.Pattern:
+        """Compile a category's patterns into a single alternation"""
+        return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), flags)
+
+    def _literal_candidates(self, content_lower: str) -> Set[str]:
+        """Patterns whose required literals occur in lower-cased ASCII content"""
+        # Each distinct literal is searched once, however many patterns share it
+        present = {key for key in self._all_literal_keys if key in content_lower}
+        return {
+            pattern for pattern, keys in self._literal_keys.items()
+            if keys is None or not present.isdisjoint(keys)
+        }
+
+    @staticmethod
+    def _could_match(pattern: str, candidates: Optional[Set[str]]) -> bool:
+        """Prefilter check; False only if the pattern cannot match"""
+        return candidates is None or pattern in candidates
+
     def _init_prompt_injection_patterns(self):
         """Initialize prompt injection and model manipulation patterns"""
         self.prompt_injection_patterns = [
@@ -118,8 +462,8 @@ class DocumentVerifier:
             r'bypass\s+(content\s+policy|safety\s+measures|restrictions)',
             r'(ignore|skip)\s+(ethical|safety|content)\s+(guidelines|constraints|limitations)',
 
-            # Hidden instructions
-            r'<!--.*?ignore.*?-->',
+            # Hidden instructions (bounded, within a single comment)
+            r'<!--(?:(?!-->).){0,500}?ignore(?:(?!-->).){0,500}?-->',
             r'\[INST\].*?\[/INST\]',
             r'<\|im_start\|>.*?<\|im_end\|>',
 
@@ -127,8 +471,10 @@ class DocumentVerifier:
             r'###\s+(system|user|assistant)\s*:',
             r'<\|system\|>|<\|user\|>|<\|assistant\|>',
 
-            # Multi-language injection
-            r'[^\x00-\x7F]{10,}.*?(ignore|system|prompt)',  # Non-ASCII + keywords
+            # Multi-language injection: keyword shortly after a run of 10+
+            # non-ASCII chars. Only tried at run starts, and the run is taken
+            # possessively, so it stays linear on long non-ASCII text
+            r'(?<![^\x00-\x7F])[^\x00-\x7F]{10}[^\x00-\x7F]*+.{0,500}?(ignore|system|prompt)',
         ]
 
     def _init_social_engineering_patterns(self):
@@ -163,7 +509,7 @@ class DocumentVerifier:
             r'(on\s+behalf\s+of|representing)\s+(IT|security|management|CEO|executive)',
 
             # Financial manipulation
-            r'\b(wire\s+transfer|payment|invoice|refund)\b.*?\b(urgent|immediate|today)\b',
+            r'\b(wire\s+transfer|payment|invoice|refund)\b.{0,200}?\b(urgent|immediate|today)\b',
             r'(update|change|verify)\s+(payment|banking|payroll)\s+(information|details)',
         ]
 
@@ -235,7 +581,7 @@ class DocumentVerifier:
         self.pii_patterns = [
             # SSN
             r'\b\d{3}-\d{2}-\d{4}\b',
-            r'\b\d{9}\b',
+            _SSN_DIGITS,
 
             # Credit card numbers
             r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b',
@@ -295,204 +641,176 @@ class DocumentVerifier:
             r'\b(data\s+breach|unauthorized\s+access|stolen\s+data)\b',
         ]
 
-    def verify_document(self, content: str, filename: str = "unknown") -> VerificationResult:
+    def verify_document(
+        self,
+        content: str,
+        filename: str = "unknown",
+        document_hash: Optional[str] = None,
+        fail_fast: bool = False
+    ) -> VerificationResult:
         """
         Perform comprehensive security verification on document content.
 
         Args:
             content: Document text content
             filename: Original filename for logging
+            document_hash: Precomputed SHA-256 hex digest (e.g. of the uploaded
+                file); when omitted, the content is hashed here
+            fail_fast: Stop scanning after the first scan category that finds a
+                CRITICAL threat. The block decision is the same, but the
+                threat list is no longer exhaustive
 
         Returns:
             VerificationResult with threat detection details
         """
+        # Document hash for audit trail; also identifies re-verified content
+        if document_hash is None:
+            document_hash = _content_sha256(content)
+
+        if not self.cache_size:
+            return self._verify_uncached(content, document_hash, fail_fast)
+
+        key = (document_hash, fail_fast)
+
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        result = self._verify_uncached(content, document_hash, fail_fast)
+
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def clear_cache(self) -> None:
+        """Drop all cached verification results"""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _verify_uncached(self, content: str, document_hash: str, fail_fast: bool) -> VerificationResult:
+        """Run all scans on content without consulting the cache"""
         threats: List[ThreatDetection] = []
 
+        # Severity and per-category counts are tallied as scans report, so
+        # the result fields below need no further passes over the threats
+        threat_counts: Dict[str, int] = {}
+        overall_severity = self._scan_window(content, threats, threat_counts, ThreatSeverity.NONE, fail_fast)
+
+        return self._build_result(threats, threat_counts, overall_severity, document_hash)
+
+    def _scan_window(
+        self,
+        content: str,
+        threats: List[ThreatDetection],
+        threat_counts: Dict[str, int],
+        overall_severity: ThreatSeverity,
+        fail_fast: bool
+    ) -> ThreatSeverity:
+        """Scan content into threats/threat_counts; return the new overall severity"""
+        # Patterns that can possibly match, from one shared prefilter pass.
+        # Only for ASCII text: there lower() and re.IGNORECASE agree exactly
+        # (other text falls back to the per-category gates)
+        candidates = None
+        compiled = self._compiled_patterns
+        if content.isascii():
+            # Unicode \s also matches \x1c-\x1f; without those characters the
+            # ASCII-mode patterns (and Hyperscan) match exactly the same spans
+            if not any(separator in content for separator in _UNICODE_ONLY_SPACES):
+                compiled = self._ascii_patterns
+                candidates = self._hyperscan_candidates(content)
+            if candidates is None:
+                candidates = self._literal_candidates(content.lower())
+
         # Run all security scans
-        threats.extend(self._scan_prompt_injection(content))
-        threats.extend(self._scan_social_engineering(content))
-        threats.extend(self._scan_cybersecurity_threats(content))
-        threats.extend(self._scan_malware_indicators(content))
-        threats.extend(self._scan_pii_exposure(content))
-        threats.extend(self._scan_offensive_content(content))
-        threats.extend(self._scan_policy_violations(content))
+        found_any = False
+        for scan in self._scans:
+            found = self._scan_category(scan, content, candidates, compiled)
+            threats.extend(found)
+            found_any = found_any or bool(found)
+            overall_severity = self._tally(found, threat_counts, overall_severity)
+            if fail_fast and overall_severity is ThreatSeverity.CRITICAL:
+                return overall_severity
 
         # Optionally use LLM for semantic analysis
-        if self.use_llm_verification and threats:
-            threats.extend(self._llm_semantic_verification(content, threats))
-
-        # Determine overall severity
-        overall_severity = self._calculate_overall_severity(threats)
-
+        if self.use_llm_verification and found_any:
+            found = self._llm_semantic_verification(content, threats)
+            threats.extend(found)
+            overall_severity = self._tally(found, threat_counts, overall_severity)
+
+        return overall_severity
+
+    def _build_result(
+        self,
+        threats: List[ThreatDetection],
+        threat_counts: Dict[str, int],
+        overall_severity: ThreatSeverity,
+        document_hash: str
+    ) -> VerificationResult:
+        """Assemble the verification result from tallied scan output"""
         # Determine if document is safe
-        is_safe = len(threats) == 0 or all(
-            t.severity in [ThreatSeverity.NONE, ThreatSeverity.LOW]
-            for t in threats
-        )
+        is_safe = overall_severity.rank <= ThreatSeverity.LOW.rank
 
         # Block high/critical threats
-        allow_ingestion = is_safe and overall_severity not in [
-            ThreatSeverity.HIGH,
-            ThreatSeverity.CRITICAL
-        ]
+        allow_ingestion = is_safe and overall_severity.rank < ThreatSeverity.HIGH.rank
 
         # Generate summary
-        summary = self._generate_summary(threats, overall_severity)
-
-        # Generate document hash for audit trail
-        import hashlib
-        document_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
+        summary = self._generate_summary(threats, overall_severity, threat_counts)
 
         return VerificationResult(
             is_safe=is_safe,
             threats_detected=threats,
             overall_severity=overall_severity,
-            document_hash=document_hash,
+            document_hash=document_hash[:16],
             verified_at=datetime.now(),
             summary=summary,
             allow_ingestion=allow_ingestion
         )
 
-    def _scan_prompt_injection(self, content: str) -> List[ThreatDetection]:
-        """Scan for prompt injection and model manipulation attempts"""
-        threats = []
-        content_lower = content.lower()
-
-        for pattern in self.prompt_injection_patterns:
-            matches = list(re.finditer(pattern, content_lower, re.IGNORECASE | re.DOTALL))
-            for match in matches:
-                context = self._extract_context(content, match.start(), match.end())
-                threats.append(ThreatDetection(
-                    category=ThreatCategory.PROMPT_INJECTION,
-                    severity=ThreatSeverity.CRITICAL,
-                    pattern=pattern,
-                    context=context,
-                    confidence=0.95,
-                    recommendation="Block document. Contains prompt injection attempt."
-                ))
-
-        return threats
-
-    def _scan_social_engineering(self, content: str) -> List[ThreatDetection]:
-        """Scan for social engineering and phishing attempts"""
+    def _spans(
+        self,
+        pattern: str,
+        content: str,
+        compiled: Dict[str, re.Pattern]
+    ) -> Iterator[Tuple[int, int]]:
+        """Match spans of one pattern, capped per pattern"""
+        if pattern == _SSN_DIGITS and compiled is self._ascii_patterns:
+            spans = _exact_digit_runs(content, 9)
+        else:
+            spans = (match.span() for match in compiled[pattern].finditer(content))
+        return islice(spans, self.max_matches_per_pattern)
+
+    def _scan_category(
+        self,
+        scan: _CategoryScan,
+        content: str,
+        candidates: Optional[Set[str]],
+        compiled: Dict[str, re.Pattern]
+    ) -> List[ThreatDetection]:
+        """Scan for one threat category's patterns"""
         threats = []
 
-        for pattern in self.social_engineering_patterns:
-            matches = list(re.finditer(pattern, content, re.IGNORECASE))
-            for match in matches:
-                context = self._extract_context(content, match.start(), match.end())
-
-                # Determine severity based on pattern type
-                severity = ThreatSeverity.HIGH
-                if 'credential' in pattern or 'password' in pattern:
-                    severity = ThreatSeverity.CRITICAL
-                elif 'urgent' in pattern or 'immediate' in pattern:
-                    severity = ThreatSeverity.HIGH
-                else:
-                    severity = ThreatSeverity.MEDIUM
+        if candidates is None and not scan.gate.search(content):
+            return threats
 
+        recommendation = _RECOMMENDATIONS[scan.category]
+        for pattern in scan.patterns:
+            if not self._could_match(pattern, candidates):
+                continue
+            severity = scan.severity_for(pattern) if scan.severity_for else scan.severity
+            for start, end in self._spans(pattern, content, compiled):
+                context = self._extract_context(content, start, end, mask_pii=scan.mask_pii)
                 threats.append(ThreatDetection(
-                    category=ThreatCategory.SOCIAL_ENGINEERING,
+                    category=scan.category,
                     severity=severity,
                     pattern=pattern,
                     context=context,
-                    confidence=0.85,
-                    recommendation="Review document. Contains social engineering indicators."
-                ))
-
-        return threats
-
-    def _scan_cybersecurity_threats(self, content: str) -> List[ThreatDetection]:
-        """Scan for cybersecurity threats and exploits"""
-        threats = []
-
-        for pattern in self.cybersecurity_patterns:
-            matches = list(re.finditer(pattern, content, re.IGNORECASE))
-            for match in matches:
-                context = self._extract_context(content, match.start(), match.end())
-                threats.append(ThreatDetection(
-                    category=ThreatCategory.CYBERSECURITY_THREAT,
-                    severity=ThreatSeverity.CRITICAL,
-                    pattern=pattern,
-                    context=context,
-                    confidence=0.90,
-                    recommendation="Block document. Contains cybersecurity threat indicators."
-                ))
-
-        return threats
-
-    def _scan_malware_indicators(self, content: str) -> List[ThreatDetection]:
-        """Scan for malware indicators"""
-        threats = []
-
-        for pattern in self.malware_patterns:
-            matches = list(re.finditer(pattern, content, re.IGNORECASE))
-            for match in matches:
-                context = self._extract_context(content, match.start(), match.end())
-                threats.append(ThreatDetection(
-                    category=ThreatCategory.MALWARE_INDICATORS,
-                    severity=ThreatSeverity.HIGH,
-                    pattern=pattern,
-                    context=context,
-                    confidence=0.80,
-                    recommendation="Block document. Contains malware indicators."
-                ))
-
-        return threats
-
-    def _scan_pii_exposure(self, content: str) -> List[ThreatDetection]:
-        """Scan for PII exposure risks"""
-        threats = []
-
-        for pattern in self.pii_patterns:
-            matches = list(re.finditer(pattern, content, re.IGNORECASE))
-            for match in matches:
-                context = self._extract_context(content, match.start(), match.end(), mask_pii=True)
-                threats.append(ThreatDetection(
-                    category=ThreatCategory.PII_EXPOSURE,
-                    severity=ThreatSeverity.HIGH,
-                    pattern=pattern,
-                    context=context,
-                    confidence=0.75,
-                    recommendation="Review document. May contain PII that should not be indexed."
-                ))
-
-        return threats
-
-    def _scan_offensive_content(self, content: str) -> List[ThreatDetection]:
-        """Scan for offensive or inappropriate content"""
-        threats = []
-
-        for pattern in self.offensive_content_patterns:
-            matches = list(re.finditer(pattern, content, re.IGNORECASE))
-            for match in matches:
-                context = self._extract_context(content, match.start(), match.end())
-                threats.append(ThreatDetection(
-                    category=ThreatCategory.OFFENSIVE_CONTENT,
-                    severity=ThreatSeverity.MEDIUM,
-                    pattern=pattern,
-                    context=context,
-                    confidence=0.70,
-                    recommendation="Review document. May contain inappropriate content."
-                ))
-
-        return threats
-
-    def _scan_policy_violations(self, content: str) -> List[ThreatDetection]:
-        """Scan for corporate policy violations"""
-        threats = []
-
-        for pattern in self.policy_violation_patterns:
-            matches = list(re.finditer(pattern, content, re.IGNORECASE))
-            for match in matches:
-                context = self._extract_context(content, match.start(), match.end())
-                threats.append(ThreatDetection(
-                    category=ThreatCategory.POLICY_VIOLATION,
-                    severity=ThreatSeverity.MEDIUM,
-                    pattern=pattern,
-                    context=context,
-                    confidence=0.65,
-                    recommendation="Review document for policy compliance."
+                    confidence=scan.confidence,
+                    recommendation=recommendation
                 ))
 
         return threats
@@ -509,56 +827,81 @@ class DocumentVerifier:
         context_end = min(len(content), end + window)
         context = content[context_start:context_end]
 
-        if mask_pii:
-            context = re.sub(r'\d{3}-\d{2}-\d{4}', 'XXX-XX-XXXX', context)
-            context = re.sub(r'\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}', 'XXXX-XXXX-XXXX-XXXX', context)
+        # Both masks need a run of 3+ digits, so most contexts skip them
+        if mask_pii and _DIGIT_RUN.search(context):
+            context = _SSN_MASK.sub('XXX-XX-XXXX', context)
+            context = _CARD_MASK.sub('XXXX-XXXX-XXXX-XXXX', context)
 
         return context.strip()
 
-    def _calculate_overall_severity(self, threats: List[ThreatDetection]) -> ThreatSeverity:
-        """Calculate overall severity from all threats"""
-        if not threats:
-            return ThreatSeverity.NONE
-
-        severity_scores = {
-            ThreatSeverity.NONE: 0,
-            ThreatSeverity.LOW: 1,
-            ThreatSeverity.MEDIUM: 2,
-            ThreatSeverity.HIGH: 3,
-            ThreatSeverity.CRITICAL: 4
-        }
-
-        max_severity = max(severity_scores[t.severity] for t in threats)
-
-        for severity, score in severity_scores.items():
-            if score == max_severity:
-                return severity
-
-        return ThreatSeverity.NONE
-
-    def _generate_summary(self, threats: List[ThreatDetection], overall_severity: ThreatSeverity) -> str:
-        """Generate human-readable summary of verification"""
-        if not threats:
-            return "Document passed all security checks. Safe for ingestion."
-
-        threat_counts = {}
+    @staticmethod
+    def _tally(
+        threats: List[ThreatDetection],
+        threat_counts: Dict[str, int],
+        overall_severity: ThreatSeverity
+    ) -> ThreatSeverity:
+        """Add threats to per-category counts; return the new overall severity"""
         for threat in threats:
             cat = threat.category.value
             threat_counts[cat] = threat_counts.get(cat, 0) + 1
+            if threat.severity.rank > overall_severity.rank:
+                overall_severity = threat.severity
+        return overall_severity
+
+    def _generate_summary(
+        self,
+        threats: List[ThreatDetection],
+        overall_severity: ThreatSeverity,
+        threat_counts: Dict[str, int]
+    ) -> str:
+        """Generate human-readable summary of verification"""
+        if not threats:
+            return _CLEAN_SUMMARY
 
         summary_parts = [
             f"Document verification: {overall_severity.value.upper()} severity",
             f"Detected {len(threats)} potential threat(s):"
         ]
+        summary_parts.extend(f"  - {cat}: {count}" for cat, count in threat_counts.items())
 
-        for cat, count in threat_counts.items():
-            summary_parts.append(f"  - {cat}: {count}")
-
-        if overall_severity in [ThreatSeverity.HIGH, ThreatSeverity.CRITICAL]:
+        if overall_severity.rank >= ThreatSeverity.HIGH.rank:
             summary_parts.append("Recommendation: BLOCK document from ingestion.")
-        elif overall_severity == ThreatSeverity.MEDIUM:
+        elif overall_severity is ThreatSeverity.MEDIUM:
             summary_parts.append("Recommendation: REVIEW document before ingestion.")
         else:
             summary_parts.append("Recommendation: Document may proceed with caution.")
 
         return "\n".join(summary_parts)
+
+
+# Per-process verifier used by process-pool workers (see verify_in_worker)
+_worker_verifier: Optional[DocumentVerifier] = None
+
+
+def init_worker_verifier(use_llm_verification: bool = False, project_id: Optional[str] = None):
+    """
+    Process-pool initializer: build one DocumentVerifier per worker process.
+
+    Args:
+        use_llm_verification: Whether to use LLM for semantic threat detection
+        project_id: GCP project ID for Vertex AI (if using LLM verification)
+    """
+    global _worker_verifier
+    _worker_verifier = DocumentVerifier(use_llm_verification=use_llm_verification, project_id=project_id)
+
+
+def verify_in_worker(
+    content: str,
+    filename: str = "unknown",
+    document_hash: Optional[str] = None,
+    fail_fast: bool = False
+) -> VerificationResult:
+    """
+    Process-pool entry point for DocumentVerifier.verify_document.
+
+    Regex scanning holds the GIL, so large documents are verified in separate
+    processes to keep other requests responsive and use every core.
+    """
+    if _worker_verifier is None:
+        init_worker_verifier()
+    return _worker_verifier.verify_document(content, filename, document_hash, fail_fast)
@@ -1,19 +1,103 @@
 """
 Feedback storage for answer quality and helpfulness ratings.
-Stores feedback in JSON file for development, can be extended to use Cloud Storage or database.
+Stores feedback in daily JSONL files for development, can be extended to use Cloud Storage or database.
 """
 import json
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from typing import BinaryIO, Iterator, List, Optional
 import os
+import threading
+import time
+from uuid import uuid4
+
+try:
+    import orjson
+except ImportError:  # stdlib json reads and writes the same lines, just slower
+    orjson = None
+
+
+def _dumps_line(record: dict) -> bytes:
+    """Serialize a record as one UTF-8 JSONL line."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass  # e.g. lone surrogates, which only the stdlib can escape
+    return (json.dumps(record) + "\n").encode()
+
+
+def _loads_line(line: bytes) -> dict:
+    """Parse one JSONL line written by _dumps_line."""
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(line)
+
+
+# (whole UTC second, its "YYYY-MM-DDTHH:MM:SS" form) for _utc_timestamp
+_last_second = (None, "")
+
+
+def _utc_timestamp() -> str:
+    """
+    Same string as datetime.utcnow().isoformat(), but the date and time are
+    only formatted once per second; each call just appends microseconds.
+    """
+    global _last_second
+    seconds, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_seconds, prefix = _last_second
+    if seconds != cached_seconds:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _last_second = (seconds, prefix)
+    return f"{prefix}.{micros:06d}" if micros else prefix
 
 
 class FeedbackStore:
-    def __init__(self, storage_path: str = "data/feedback"):
+    def __init__(self, storage_path: str = "data/feedback", flush_on_write: bool = False):
+        """
+        Args:
+            storage_path: Directory holding the feedback-YYYY-MM-DD.jsonl files
+            flush_on_write: fsync after every record (durable, but slower)
+        """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        # Single pre-sharding file; still read, no longer written
         self.feedback_file = self.storage_path / "feedback.jsonl"
+        self.stats_file = self.storage_path / "stats.json"
+        self.flush_on_write = flush_on_write
+
+        # Handle on the current day's file, kept open until the day changes;
+        # unbuffered, so each record reaches the OS in a single write
+        self._lock = threading.Lock()
+        self._fh: Optional[BinaryIO] = None
+        self._fh_day: Optional[str] = None
+
+        # Running stats cover each file up to _stats["offsets"][name]; each
+        # stats request only parses records appended since (by any process)
+        self._stats = self._load_stats_snapshot()
+        self._catch_up_stats()
+
+    def close(self) -> None:
+        """Save the running stats and close the feedback file handle."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+                self._fh_day = None
+
+            tmp_file = self.stats_file.with_suffix(".tmp")
+            try:
+                tmp_file.write_bytes(_dumps_line(self._stats))
+                os.replace(tmp_file, self.stats_file)
+            except OSError:
+                pass  # the next start rescans the feedback file instead
+
+    def __del__(self):
+        fh = getattr(self, "_fh", None)
+        if fh is not None:
+            fh.close()
 
     def save_feedback(
         self,
@@ -40,9 +124,10 @@ class FeedbackStore:
         Returns:
             dict: Saved feedback record with timestamp and ID
         """
+        timestamp = _utc_timestamp()
         feedback_record = {
             "id": self._generate_id(),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "question": question,
             "answer": answer[:500],  # Store first 500 chars
             "rating": rating,
@@ -52,60 +137,130 @@ class FeedbackStore:
             "session_id": session_id
         }
 
-        # Append to JSONL file
-        with open(self.feedback_file, "a") as f:
-            f.write(json.dumps(feedback_record) + "\n")
+        # Append to the JSONL file for the record's UTC day
+        line = _dumps_line(feedback_record)
+        day = timestamp[:10]
+        with self._lock:
+            if day != self._fh_day:
+                if self._fh is not None:
+                    self._fh.close()
+                self._fh = open(self._day_file(day), "ab", buffering=0)
+                self._fh_day = day
+            self._fh.write(line)
+            if self.flush_on_write:
+                os.fsync(self._fh.fileno())
 
         return feedback_record
 
+    def iter_feedback(self) -> Iterator[dict]:
+        """Yield feedback records one at a time, oldest first."""
+        for path in self._feedback_files():
+            with open(path, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        yield _loads_line(line)
+
     def get_all_feedback(self) -> list[dict]:
         """Retrieve all feedback records."""
-        if not self.feedback_file.exists():
-            return []
-
-        feedback_list = []
-        with open(self.feedback_file, "r") as f:
-            for line in f:
-                if line.strip():
-                    feedback_list.append(json.loads(line))
-
-        return feedback_list
+        return list(self.iter_feedback())
 
     def get_feedback_stats(self) -> dict:
         """Get statistics about feedback."""
-        all_feedback = self.get_all_feedback()
+        with self._lock:
+            self._catch_up_stats()
+            stats = self._stats
+            total = stats["total"]
+
+            if not total:
+                return {
+                    "total_responses": 0,
+                    "average_rating": 0,
+                    "helpful_percentage": 0,
+                    "total_comments": 0
+                }
 
-        if not all_feedback:
             return {
-                "total_responses": 0,
-                "average_rating": 0,
-                "helpful_percentage": 0,
-                "total_comments": 0
+                "total_responses": total,
+                "average_rating": round(stats["rating_sum"] / total, 2),
+                "helpful_percentage": round((stats["helpful_count"] / total) * 100, 1),
+                "total_comments": stats["comment_count"],
+                "rating_distribution": dict(stats["distribution"])
             }
 
-        total = len(all_feedback)
-        avg_rating = sum(f["rating"] for f in all_feedback) / total
-        helpful_count = sum(1 for f in all_feedback if f["was_helpful"])
-        comment_count = sum(1 for f in all_feedback if f.get("comment"))
+    def _day_file(self, day: str) -> Path:
+        """Feedback file for a UTC day (YYYY-MM-DD)."""
+        return self.storage_path / f"feedback-{day}.jsonl"
+
+    def _feedback_files(self) -> List[Path]:
+        """All feedback files, oldest first."""
+        files = sorted(self.storage_path.glob("feedback-*.jsonl"))
+        if self.feedback_file.exists():
+            files.insert(0, self.feedback_file)
+        return files
 
+    @staticmethod
+    def _empty_stats() -> dict:
+        """Running stats for an empty store."""
         return {
-            "total_responses": total,
-            "average_rating": round(avg_rating, 2),
-            "helpful_percentage": round((helpful_count / total) * 100, 1),
-            "total_comments": comment_count,
-            "rating_distribution": self._get_rating_distribution(all_feedback)
+            "offsets": {},
+            "total": 0,
+            "rating_sum": 0,
+            "helpful_count": 0,
+            "comment_count": 0,
+            "distribution": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
         }
 
-    def _get_rating_distribution(self, feedback_list: list[dict]) -> dict:
-        """Get distribution of ratings."""
-        distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        for feedback in feedback_list:
-            rating = feedback.get("rating", 0)
-            if rating in distribution:
-                distribution[rating] += 1
-        return distribution
+    def _load_stats_snapshot(self) -> dict:
+        """
+        Stats saved by close(), unless a feedback file has since shrunk.
+
+        Files that were removed (e.g. archived old days) stay counted.
+        """
+        try:
+            snapshot = _loads_line(self.stats_file.read_bytes())
+            snapshot["distribution"] = {
+                int(rating): count for rating, count in snapshot["distribution"].items()
+            }
+            for name, offset in snapshot["offsets"].items():
+                path = self.storage_path / name
+                if path.exists() and path.stat().st_size < offset:
+                    return self._empty_stats()
+            return snapshot
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return self._empty_stats()
+
+    def _catch_up_stats(self) -> None:
+        """Fold records appended since the last call into the running stats."""
+        stats = self._stats
+        offsets = stats["offsets"]
+        distribution = stats["distribution"]
+        for path in self._feedback_files():
+            offset = offsets.get(path.name, 0)
+            if path.stat().st_size <= offset:
+                continue  # closed days cost one stat() call
+
+            with open(path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # another writer is mid-record; pick it up next time
+                    if not line.strip():
+                        offset += len(line)
+                        continue
+
+                    record = _loads_line(line)
+                    rating = record["rating"]
+                    stats["total"] += 1
+                    stats["rating_sum"] += rating
+                    if record["was_helpful"]:
+                        stats["helpful_count"] += 1
+                    if record.get("comment"):
+                        stats["comment_count"] += 1
+                    if rating in distribution:
+                        distribution[rating] += 1
+                    offset += len(line)
+                    offsets[path.name] = offset
 
     def _generate_id(self) -> str:
         """Generate unique feedback ID."""
-        from uuid import uuid4
         return f"fb_{uuid4().hex[:12]}"
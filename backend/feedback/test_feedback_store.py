@@ -0,0 +1,112 @@
+"""
+Unit Tests for Feedback Store
+
+Tests feedback persistence and the running feedback statistics.
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from backend.feedback.feedback_store import FeedbackStore
+
+
+class TestFeedbackStore:
+    """Test suite for FeedbackStore"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Fixture providing a FeedbackStore in a temporary directory"""
+        store = FeedbackStore(storage_path=str(tmp_path))
+        yield store
+        store.close()
+
+    def test_save_and_read_back(self, store):
+        """Test saved records are returned in order"""
+        store.save_feedback("¿Dónde está el baño?", "Al fondo", 5, True, comment="gracias")
+        store.save_feedback("Return policy?", "30 days", 2, False)
+
+        records = store.get_all_feedback()
+
+        assert [r["question"] for r in records] == ["¿Dónde está el baño?", "Return policy?"]
+        assert records[0]["comment"] == "gracias"
+
+    def test_empty_stats(self, store):
+        """Test stats with no feedback"""
+        stats = store.get_feedback_stats()
+
+        assert stats["total_responses"] == 0
+        assert stats["average_rating"] == 0
+
+    def test_stats(self, store):
+        """Test stats aggregate every saved record"""
+        store.save_feedback("q1", "a", 5, True, comment="great")
+        store.save_feedback("q2", "a", 4, True)
+        store.get_feedback_stats()
+        store.save_feedback("q3", "a", 1, False, comment="wrong store")
+
+        stats = store.get_feedback_stats()
+
+        assert stats["total_responses"] == 3
+        assert stats["average_rating"] == 3.33
+        assert stats["helpful_percentage"] == 66.7
+        assert stats["total_comments"] == 2
+        assert stats["rating_distribution"] == {1: 1, 2: 0, 3: 0, 4: 1, 5: 1}
+
+    def test_stats_include_other_writers(self, store, tmp_path):
+        """Test stats pick up records appended by another store instance"""
+        other = FeedbackStore(storage_path=str(tmp_path))
+        store.save_feedback("q1", "a", 5, True)
+        other.save_feedback("q2", "a", 3, True)
+        other.close()
+
+        assert store.get_feedback_stats()["total_responses"] == 2
+
+    def test_stats_restored_after_restart(self, store, tmp_path):
+        """Test saved stats are reused and extended on the next start"""
+        store.save_feedback("q1", "a", 5, True)
+        store.save_feedback("q2", "a", 3, False)
+        store.close()
+
+        restarted = FeedbackStore(storage_path=str(tmp_path))
+        restarted.save_feedback("q3", "a", 4, True)
+        stats = restarted.get_feedback_stats()
+        restarted.close()
+
+        assert (tmp_path / "stats.json").exists()
+        assert stats["total_responses"] == 3
+        assert stats["rating_distribution"] == {1: 0, 2: 0, 3: 1, 4: 1, 5: 1}
+
+    def test_timestamp_format(self, store):
+        """Test timestamps keep the datetime.isoformat() layout"""
+        record = store.save_feedback("q1", "a", 5, True)
+
+        assert datetime.fromisoformat(record["timestamp"]).tzinfo is None
+        assert record["timestamp"][10] == "T"
+
+    def test_records_sharded_by_day(self, store, tmp_path):
+        """Test each UTC day gets its own file and all days are read back"""
+        timestamps = ["2025-01-01T23:59:59.999999", "2025-01-02T00:00:00"]
+        with patch("backend.feedback.feedback_store._utc_timestamp", side_effect=timestamps):
+            store.save_feedback("q1", "a", 5, True)
+            store.save_feedback("q2", "a", 1, False)
+
+        assert (tmp_path / "feedback-2025-01-01.jsonl").exists()
+        assert (tmp_path / "feedback-2025-01-02.jsonl").exists()
+        assert [r["question"] for r in store.get_all_feedback()] == ["q1", "q2"]
+        assert store.get_feedback_stats()["total_responses"] == 2
+
+    def test_reads_pre_sharding_file(self, tmp_path):
+        """Test records in the old single feedback.jsonl are still included"""
+        (tmp_path / "feedback.jsonl").write_text(
+            '{"id": "fb_1", "question": "old", "rating": 4, "was_helpful": true}\n'
+        )
+        store = FeedbackStore(storage_path=str(tmp_path))
+        store.save_feedback("new", "a", 2, False)
+
+        assert [r["question"] for r in store.get_all_feedback()] == ["old", "new"]
+        assert store.get_feedback_stats()["average_rating"] == 3.0
+        store.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,7 +6,9 @@ Uses pattern-based detection for reliability and testability.
 """
 
 import re
-from typing import Tuple
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple, Tuple
 from enum import Enum
 
 
@@ -16,6 +18,107 @@ class Language(Enum):
     SPANISH = "es"
 
 
+def _compile_indicators(indicators):
+    """
+    Compile word-boundary indicator patterns into one case-insensitive regex.
+
+    Each group becomes an atomic alternation with its longest words first, so
+    the engine commits to the first word that matches instead of backtracking
+    through its siblings; longest-first keeps e.g. 'está' from losing to 'es'.
+    """
+    groups = []
+    for indicator in indicators:
+        words = sorted(indicator[3:-3].split('|'), key=len, reverse=True)
+        groups.append(r'\b(?>' + '|'.join(words) + r')\b')
+    return re.compile('|'.join(groups), re.IGNORECASE)
+
+
+# Spanish-specific characters (not common in English)
+_SPANISH_CHARS = re.compile(r'[ñáéíóúü¿¡]', re.IGNORECASE)
+
+# Common Spanish words that are highly indicative
+# These are selected to minimize false positives
+_SPANISH_INDICATORS = (
+    # Question words
+    r'\b(qué|quién|quiénes|cuál|cuáles|cuándo|cuánto|cuánta|cuántos|cuántas|dónde|cómo|por qué)\b',
+
+    # Common verbs
+    r'\b(es|son|está|están|hay|tiene|tienen|puede|pueden|quiere|quieren|necesita|necesitan)\b',
+
+    # Articles and pronouns
+    r'\b(el|la|los|las|un|una|unos|unas|mi|mis|tu|tus|su|sus|nuestro|nuestra)\b',
+
+    # Prepositions
+    r'\b(de|del|para|por|con|sin|sobre|entre|desde|hasta)\b',
+
+    # Common adjectives
+    r'\b(bueno|buena|malo|mala|nuevo|nueva|viejo|vieja|grande|pequeño|pequeña)\b',
+
+    # Time/date
+    r'\b(hoy|ayer|mañana|ahora|antes|después|siempre|nunca)\b',
+
+    # Common nouns
+    r'\b(tienda|producto|cliente|problema|ayuda|información|sistema)\b',
+)
+
+_SPANISH_PATTERN = _compile_indicators(_SPANISH_INDICATORS)
+
+# English-specific common words (for confidence)
+_ENGLISH_INDICATORS = (
+    r'\b(the|is|are|was|were|have|has|had|will|would|could|should)\b',
+    r'\b(what|when|where|why|how|who|which)\b',
+    r'\b(this|that|these|those|my|your|our|their)\b',
+    r'\b(store|product|customer|problem|help|information|system)\b',
+)
+
+_ENGLISH_PATTERN = _compile_indicators(_ENGLISH_INDICATORS)
+
+
+def _indicator_words(indicators):
+    """Single-word alternatives of the word-boundary indicator patterns"""
+    for indicator in indicators:
+        for word in indicator[3:-3].split('|'):
+            if ' ' not in word:
+                yield word
+
+
+# Inputs up to this length are served from the detect() LRU cache
+SHORT_TEXT_CACHE_LIMIT = 256
+
+# ASCII inputs shorter than this with no Spanish indicator word are answered
+# without scoring
+SHORT_ASCII_LIMIT = 20
+
+# Single-scan form of the patterns above: one pass tokenizes the text into
+# words (plus ¿/¡), and each category is counted from the token frequencies.
+# Indicator words are matched as whole tokens, which is what the \b...\b
+# alternations match
+_TOKEN_PATTERN = re.compile(r'\w+|[¿¡]')
+# Maps every ASCII character outside \w to a space and upper case to lower
+_ASCII_TOKEN_TABLE = str.maketrans({
+    chr(code): ' ' if not _TOKEN_PATTERN.fullmatch(chr(code)) else chr(code).lower()
+    for code in range(128)
+})
+_SPANISH_WORDS = frozenset(_indicator_words(_SPANISH_INDICATORS))
+_ENGLISH_WORDS = frozenset(_indicator_words(_ENGLISH_INDICATORS))
+
+# Characters besides ASCII and the Spanish letters in the indicators
+_UNUSUAL_CHARS = re.compile(r'[^\x00-\x7fñáéíóúü]')
+
+# The one multi-word indicator: counted once, not as "por" + "qué"
+_SPANISH_PHRASE = re.compile(r'\bpor qué\b')
+
+
+class _Detection(NamedTuple):
+    """Detection result with the counts it was scored from"""
+    language: Language
+    confidence: float
+    spanish_chars: int = 0
+    spanish_matches: int = 0
+    english_matches: int = 0
+    total_words: int = 0
+
+
 class LanguageDetector:
     """
     Deterministic language detector for English and Spanish.
@@ -28,52 +131,62 @@ class LanguageDetector:
     """
 
     def __init__(self):
-        # Spanish-specific characters (not common in English)
-        self.spanish_chars = re.compile(r'[ñáéíóúü¿¡]', re.IGNORECASE)
-
-        # Common Spanish words that are highly indicative
-        # These are selected to minimize false positives
-        self.spanish_indicators = [
-            # Question words
-            r'\b(qué|quién|quiénes|cuál|cuáles|cuándo|cuánto|cuánta|cuántos|cuántas|dónde|cómo|por qué)\b',
-
-            # Common verbs
-            r'\b(es|son|está|están|hay|tiene|tienen|puede|pueden|quiere|quieren|necesita|necesitan)\b',
-
-            # Articles and pronouns
-            r'\b(el|la|los|las|un|una|unos|unas|mi|mis|tu|tus|su|sus|nuestro|nuestra)\b',
-
-            # Prepositions
-            r'\b(de|del|para|por|con|sin|sobre|entre|desde|hasta)\b',
+        # Patterns and vocabularies are built once at import time and shared
+        # by every detector instance
+        self.spanish_chars = _SPANISH_CHARS
+        self.spanish_indicators = list(_SPANISH_INDICATORS)
+        self.spanish_pattern = _SPANISH_PATTERN
+        self.english_indicators = list(_ENGLISH_INDICATORS)
+        self.english_pattern = _ENGLISH_PATTERN
+
+        self._token_pattern = _TOKEN_PATTERN
+        self._spanish_words = _SPANISH_WORDS
+        self._english_words = _ENGLISH_WORDS
+        self._unusual_chars = _UNUSUAL_CHARS
+        self._spanish_phrase = _SPANISH_PHRASE
+
+        # Short inputs (questions, greetings, language hints) repeat often
+        self._detect_cached = lru_cache(maxsize=2048)(self._detect_impl)
+
+    def _count_indicators(self, text: str) -> Tuple[int, int, int, int]:
+        """
+        Count Spanish characters, Spanish indicator words, English indicator
+        words and total words in text, case-insensitively, with a single scan.
+        """
+        if text.isascii():
+            # Same tokens as the regex on lower-cased text: one translate pass
+            # folds case and blanks out non-word characters, then split
+            counts = Counter(text.translate(_ASCII_TOKEN_TABLE).split())
+        else:
+            text = text.lower()
+            counts = Counter(self._token_pattern.findall(text))
 
-            # Common adjectives
-            r'\b(bueno|buena|malo|mala|nuevo|nueva|viejo|vieja|grande|pequeño|pequeña)\b',
+        marks = counts.pop('¿', 0) + counts.pop('¡', 0)
+        total_words = sum(counts.values())
 
-            # Time/date
-            r'\b(hoy|ayer|mañana|ahora|antes|después|siempre|nunca)\b',
+        spanish_matches = sum(counts[word] for word in self._spanish_words if word in counts)
+        english_matches = sum(counts[word] for word in self._english_words if word in counts)
+        spanish_chars_count = marks
 
-            # Common nouns
-            r'\b(tienda|producto|cliente|problema|ayuda|información|sistema)\b',
-        ]
+        for token, count in counts.items():
+            if token.isascii():
+                continue
+            spanish_chars_count += len(self.spanish_chars.findall(token)) * count
 
-        # Compile patterns for performance
-        self.spanish_pattern = re.compile(
-            '|'.join(self.spanish_indicators),
-            re.IGNORECASE
-        )
+            # Tokens with other non-ASCII letters can match an indicator under
+            # case-insensitive matching without being equal to it (e.g. 'eſ' ~
+            # 'es'); only those fall back to the alternation patterns
+            if not self._unusual_chars.search(token):
+                continue
+            if token not in self._spanish_words and self.spanish_pattern.fullmatch(token):
+                spanish_matches += count
+            if token not in self._english_words and self.english_pattern.fullmatch(token):
+                english_matches += count
 
-        # English-specific common words (for confidence)
-        self.english_indicators = [
-            r'\b(the|is|are|was|were|have|has|had|will|would|could|should)\b',
-            r'\b(what|when|where|why|how|who|which)\b',
-            r'\b(this|that|these|those|my|your|our|their)\b',
-            r'\b(store|product|customer|problem|help|information|system)\b',
-        ]
+        if 'por' in counts and 'qué' in counts:
+            spanish_matches -= len(self._spanish_phrase.findall(text))
 
-        self.english_pattern = re.compile(
-            '|'.join(self.english_indicators),
-            re.IGNORECASE
-        )
+        return spanish_chars_count, spanish_matches, english_matches, total_words
 
     def detect(self, text: str) -> Tuple[Language, float]:
         """
@@ -92,24 +205,36 @@ class LanguageDetector:
         4. Calculate confidence based on ratios
         5. Default to English if confidence < 0.7
         """
+        if len(text) < SHORT_ASCII_LIMIT and text.isascii():
+            words = text.translate(_ASCII_TOKEN_TABLE).split()
+            if _SPANISH_WORDS.isdisjoint(words):
+                # No Spanish characters or indicator words: the Spanish score
+                # is 0, so the result is English at the 0.7 confidence floor
+                return Language.ENGLISH, (0.7 if words else 1.0)
+
+        detection = self._detect_full(text)
+        return detection.language, detection.confidence
+
+    def _detect_full(self, text: str) -> _Detection:
+        """Full detection result, cached for short inputs"""
+        if len(text) <= SHORT_TEXT_CACHE_LIMIT:
+            return self._detect_cached(text)
+        return self._detect_impl(text)
+
+    def _detect_impl(self, text: str) -> _Detection:
+        """Uncached detection; depends only on the text"""
         if not text or not text.strip():
-            return Language.ENGLISH, 1.0
-
-        text = text.lower().strip()
-
-        # Quick check: Spanish-specific characters
-        spanish_chars_count = len(self.spanish_chars.findall(text))
+            return _Detection(Language.ENGLISH, 1.0)
 
-        # Count indicator words
-        spanish_matches = len(self.spanish_pattern.findall(text))
-        english_matches = len(self.english_pattern.findall(text))
+        # Spanish-specific characters, indicator words and total words (for
+        # normalization), all from one scan
+        spanish_chars_count, spanish_matches, english_matches, total_words = \
+            self._count_indicators(text)
 
-        # Calculate total words for normalization
-        words = re.findall(r'\b\w+\b', text)
-        total_words = len(words)
+        counts = (spanish_chars_count, spanish_matches, english_matches, total_words)
 
         if total_words == 0:
-            return Language.ENGLISH, 1.0
+            return _Detection(Language.ENGLISH, 1.0, *counts)
 
         # Scoring algorithm
         spanish_score = 0.0
@@ -127,10 +252,10 @@ class LanguageDetector:
         # Determine language
         if spanish_score > english_score and spanish_score >= 0.3:
             confidence = min(spanish_score, 1.0)
-            return Language.SPANISH, confidence
+            return _Detection(Language.SPANISH, confidence, *counts)
         else:
             confidence = max(english_score, 0.7)  # Default to high confidence for English
-            return Language.ENGLISH, min(confidence, 1.0)
+            return _Detection(Language.ENGLISH, min(confidence, 1.0), *counts)
 
     def detect_language_code(self, text: str) -> str:
         """
@@ -155,13 +280,18 @@ class LanguageDetector:
         Returns:
             Dictionary with language, confidence, and detection details
         """
-        language, confidence = self.detect(text)
+        # Same single pass as detect(); the counts come along with the result
+        detection = self._detect_full(text)
+        language = detection.language
 
         return {
             "language": language.value,
             "language_name": "English" if language == Language.ENGLISH else "Spanish",
-            "confidence": round(confidence, 2),
+            "confidence": round(detection.confidence, 2),
             "text_length": len(text),
+            "word_count": detection.total_words,
+            "spanish_indicators": detection.spanish_matches,
+            "english_indicators": detection.english_matches,
             "detection_method": "pattern_based"
         }
 
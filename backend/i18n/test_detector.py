@@ -5,7 +5,8 @@ Tests deterministic language detection for English and Spanish.
 """
 
 import pytest
-from backend.i18n.detector import LanguageDetector, Language
+from unittest.mock import patch
+from backend.i18n.detector import LanguageDetector, Language, SHORT_TEXT_CACHE_LIMIT
 
 
 class TestLanguageDetector:
@@ -157,6 +158,9 @@ class TestLanguageDetector:
         assert metadata["language_name"] == "Spanish"
         assert metadata["text_length"] == len(text)
         assert metadata["detection_method"] == "pattern_based"
+        assert metadata["word_count"] == 3
+        assert metadata["spanish_indicators"] == 2
+        assert metadata["english_indicators"] == 0
 
     # Real-World Scenarios
 
@@ -234,6 +238,37 @@ class TestLanguageDetector:
         assert lang_upper == Language.SPANISH
         assert lang_mixed == Language.SPANISH
 
+    def test_upper_case_spanish_greeting(self, detector):
+        """Test detection: upper-case Spanish with accents"""
+        lang, _ = detector.detect("HOLA CÓMO ESTÁS")
+
+        assert lang == Language.SPANISH
+
+    def test_short_ascii_spanish(self, detector):
+        """Test short unaccented Spanish is not taken for English"""
+        lang, _ = detector.detect("es la tienda")
+
+        assert lang == Language.SPANISH
+
+    # Caching
+
+    def test_short_text_served_from_cache(self, detector):
+        """Test repeated short inputs reuse the cached detection"""
+        text = "¿Dónde está el baño?"
+        first = detector.detect(text)
+
+        with patch.object(detector, "_count_indicators") as count:
+            assert detector.detect(text) == first
+            count.assert_not_called()
+
+    def test_long_text_not_cached(self, detector):
+        """Test inputs over the cache limit are always re-detected"""
+        text = "What is the store policy on returns? " * 10
+        assert len(text) > SHORT_TEXT_CACHE_LIMIT
+
+        detector.detect(text)
+        assert detector._detect_cached.cache_info().currsize == 0
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -7,10 +7,21 @@ Loads translations from JSON files and supports variable interpolation.
 
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 
+# {{variable}} placeholders in translation strings
+_VAR_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# Accepted spellings of each supported language; anything else is English
+_LANG_NORM = {
+    'en': 'en', 'eng': 'en', 'english': 'en', 'en-us': 'en', 'en-gb': 'en',
+    'es': 'es', 'esp': 'es', 'spanish': 'es', 'es-es': 'es', 'es-mx': 'es', 'español': 'es',
+}
+
+
 class TranslationService:
     """
     Translation service for loading and managing translations.
@@ -24,6 +35,14 @@ class TranslationService:
 
     def __init__(self):
         self.translations: Dict[str, Dict[str, Any]] = {}
+
+        # Per language, every string leaf keyed by its dotted path
+        self._flat: Dict[str, Dict[str, str]] = {}
+
+        # (key, language) -> resolved string; the key space is small and
+        # the same strings are looked up on every render
+        self._resolve = lru_cache(maxsize=4096)(self._resolve_uncached)
+
         self.load_translations()
 
     def load_translations(self):
@@ -42,6 +61,22 @@ class TranslationService:
             with open(es_file, 'r', encoding='utf-8') as f:
                 self.translations['es'] = json.load(f)
 
+        self._flat = {
+            language: dict(self._flatten(tree))
+            for language, tree in self.translations.items()
+        }
+        self._resolve.cache_clear()
+
+    @classmethod
+    def _flatten(cls, tree: Dict[str, Any], prefix: str = ''):
+        """Yield (dotted key, text) for every string leaf of a nested dict"""
+        for k, value in tree.items():
+            key = f"{prefix}.{k}" if prefix else k
+            if isinstance(value, dict):
+                yield from cls._flatten(value, key)
+            elif isinstance(value, str):
+                yield key, value
+
     def get(self, key: str, language: str = 'en', **variables) -> str:
         """
         Get translated text for a given key.
@@ -57,6 +92,20 @@ class TranslationService:
         Example:
             translator.get("errors.generic", language="es", error="Connection failed")
         """
+        text = self._resolve(key, language)
+
+        # If not found, return key
+        if text is None:
+            return key
+
+        # Interpolate variables
+        if variables:
+            text = self._interpolate(text, variables)
+
+        return text
+
+    def _resolve_uncached(self, key: str, language: str) -> Optional[str]:
+        """Translation for key in language, falling back to English"""
         # Normalize language code
         language = self._normalize_language(language)
 
@@ -67,32 +116,15 @@ class TranslationService:
         if text is None and language != 'en':
             text = self._get_nested_key(key, 'en')
 
-        # If still not found, return key
-        if text is None:
-            return key
-
-        # Interpolate variables
-        if variables:
-            text = self._interpolate(text, variables)
-
         return text
 
     def _normalize_language(self, language: str) -> str:
         """Normalize language code to 'en' or 'es'"""
-        language = language.lower().strip()
-
-        # Handle variations
-        if language in ['en', 'eng', 'english', 'en-us', 'en-gb']:
-            return 'en'
-        elif language in ['es', 'esp', 'spanish', 'es-es', 'es-mx', 'español']:
-            return 'es'
-
-        # Default to English
-        return 'en'
+        return _LANG_NORM.get(language.lower().strip(), 'en')
 
     def _get_nested_key(self, key: str, language: str) -> Optional[str]:
         """
-        Get value from nested dictionary using dot notation.
+        Get value for a dot-notation key from the flattened translations.
 
         Args:
             key: Dot-separated key path (e.g., "app.title")
@@ -101,19 +133,7 @@ class TranslationService:
         Returns:
             Translation string or None if not found
         """
-        if language not in self.translations:
-            return None
-
-        keys = key.split('.')
-        value = self.translations[language]
-
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return None
-
-        return value if isinstance(value, str) else None
+        return self._flat.get(language, {}).get(key)
 
     def _interpolate(self, text: str, variables: Dict[str, Any]) -> str:
         """
@@ -128,11 +148,14 @@ class TranslationService:
         Returns:
             Text with variables replaced
         """
+        if '{{' not in text:
+            return text
+
         def replace_var(match):
             var_name = match.group(1)
             return str(variables.get(var_name, match.group(0)))
 
-        return re.sub(r'\{\{(\w+)\}\}', replace_var, text)
+        return _VAR_RE.sub(replace_var, text)
 
     def get_all(self, language: str = 'en') -> Dict[str, Any]:
         """
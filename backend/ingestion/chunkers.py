@@ -1,10 +1,16 @@
-from nltk.tokenize import sent_tokenize
-from sklearn.metrics.pairwise import cosine_similarity
+from nltk.tokenize.punkt import PunktTokenizer
 from typing import List
 from backend.ingestion.embedders import BaseEmbedder
 import nltk
+import numpy as np
 
-nltk.download('punkt_tab')
+try:
+    nltk.data.find('tokenizers/punkt_tab')
+except LookupError:
+    nltk.download('punkt_tab', quiet=True)
+
+# Loaded once per process; sent_tokenize would look it up on every call
+_split_sentences = PunktTokenizer('english').tokenize
 
 
 class Chunker:
@@ -17,17 +23,31 @@ class Chunker:
     # Sentence Sliding Window Chunking
     # -----------------------------------------
     def sentence_chunker(self, text: str) -> List[str]:
-        sentences = sent_tokenize(text)
+        sentences = _split_sentences(text)
         chunks, current_chunk = [], []
+        # Length of " ".join(current_chunk), and how many of its sentences
+        # were carried over from the previous chunk
+        current_len, carried = 0, 0
 
         for sent in sentences:
+            current_len += len(sent) + (1 if current_chunk else 0)
             current_chunk.append(sent)
 
-            if len(" ".join(current_chunk)) >= self.chunk_size:
+            if current_len >= self.chunk_size:
                 chunks.append(" ".join(current_chunk))
-                current_chunk = current_chunk[-self.overlap:]
 
-        if current_chunk:
+                # Carry over the trailing sentences that fit in `overlap`
+                # characters (never the whole chunk)
+                carried, tail_len = 0, -1
+                for prev in reversed(current_chunk[1:]):
+                    if tail_len + len(prev) + 1 > self.overlap:
+                        break
+                    tail_len += len(prev) + 1
+                    carried += 1
+                current_chunk = current_chunk[len(current_chunk) - carried:]
+                current_len = max(tail_len, 0)
+
+        if len(current_chunk) > carried:
             chunks.append(" ".join(current_chunk))
 
         return chunks
@@ -36,20 +56,20 @@ class Chunker:
     # Semantic Chunking using SAME embedder
     # -----------------------------------------
     def semantic_chunker(self, text: str, threshold: float = 0.75) -> List[str]:
-        sentences = sent_tokenize(text)
+        sentences = _split_sentences(text)
         if len(sentences) <= 1:
             return sentences
 
-        embeddings = self.embedder.embed(sentences)
+        embeddings = self.embedder.embed_array(sentences)
+
+        # Cosine similarity of each sentence with the next, in one batch
+        embeddings = embeddings / (np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12)
+        similarities = np.einsum('ij,ij->i', embeddings[:-1], embeddings[1:])
 
         chunks, current_chunk = [], [sentences[0]]
 
         for i in range(1, len(sentences)):
-            sim = cosine_similarity(
-                [embeddings[i-1]], [embeddings[i]]
-            )[0][0]
-
-            if sim < threshold:
+            if similarities[i-1] < threshold:
                 chunks.append(" ".join(current_chunk))
                 current_chunk = []
 
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from sentence_transformers import SentenceTransformer
 from typing import List
+import numpy as np
+import os
 
 
 # ------------------------------
@@ -12,13 +14,36 @@ class BaseEmbedder(ABC):
     def embed(self, texts: List[str]) -> List[list]:
         pass
 
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        # float32 matrix form of embed(); override when the model produces
+        # arrays natively to skip the list round trip
+        return np.asarray(self.embed(texts), dtype=np.float32)
+
 
 # ------------------------------
 # Local SBERT Embedder
 # ------------------------------
 class SentenceTransformerEmbedder(BaseEmbedder):
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int | None = None):
         self.model = SentenceTransformer(model_name)
+        # fp16 halves memory traffic on GPU; CPU inference stays fp32
+        if self.model.device.type == "cuda":
+            self.model.half()
+        # All texts go through one encode() call, which batches internally
+        self.batch_size = batch_size or int(os.getenv("EMBED_BATCH_SIZE", "64"))
 
     def embed(self, texts: List[str]) -> List[list]:
-        return self.model.encode(texts, show_progress_bar=True).tolist()
+        if not texts:
+            return []
+        return self.embed_array(texts).tolist()
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        # float32 matrix (4 bytes/dim) instead of nested lists of Python
+        # floats (~24 bytes/dim); vector stores that accept arrays take this
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        ).astype(np.float32, copy=False)
@@ -3,11 +3,43 @@
 from pypdf import PdfReader
 from docx import Document
 from pathlib import Path
+from concurrent.futures import Executor
+
+# PDFs with more pages than this are extracted in page ranges of this size,
+# one range per worker task
+PDF_PAGES_PER_TASK = 16
+
+
+def _extract_pdf_pages(path: Path, start: int, stop: int) -> list[str]:
+    """Text of pages [start, stop) of a PDF; runs in a worker process."""
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
 
 
 class DocumentProcessor:
-    def __init__(self, document_paths: Path | list[Path]) -> None:
+    def __init__(
+        self,
+        document_paths: Path | list[Path] | None = None,
+        executor: Executor | None = None
+    ) -> None:
+        """
+        Args:
+            document_paths: Documents to process right away
+            executor: Process pool for extracting large PDFs in parallel;
+                pypdf is pure Python, so threads would not help
+        """
         self.document_dict: dict[str, str] = {}
+        self.executor = executor
+
+        if document_paths is not None:
+            self.document_dict = self.process(document_paths)
+
+    def process(self, document_paths: Path | list[Path]) -> dict[str, str]:
+        """Extract text from the given documents, keyed by file name.
+
+        Holds no per-call state, so one processor can be shared across requests.
+        """
+        document_dict: dict[str, str] = {}
 
         if isinstance(document_paths, (str, Path)):
             document_paths = [Path(document_paths)]
@@ -19,13 +51,13 @@ class DocumentProcessor:
 
             try:
                 if suffix == ".pdf":
-                    self.document_dict[doc_path.name] = self._load_pdf(doc_path)
+                    document_dict[doc_path.name] = self._load_pdf(doc_path)
 
                 elif suffix == ".docx":
-                    self.document_dict[doc_path.name] = self._load_docx(doc_path)
+                    document_dict[doc_path.name] = self._load_docx(doc_path)
 
                 elif suffix == ".txt":
-                    self.document_dict[doc_path.name] = doc_path.read_text(encoding="utf8")
+                    document_dict[doc_path.name] = doc_path.read_text(encoding="utf8")
 
                 else:
                     print(f"Skipping unsupported file: {doc_path.name}")
@@ -33,9 +65,24 @@ class DocumentProcessor:
             except Exception as e:
                 print(f"Failed processing {doc_path.name}: {e}")
 
+        return document_dict
+
     def _load_pdf(self, path: Path) -> str:
         reader = PdfReader(path)
-        return "\n".join([p.extract_text() or "" for p in reader.pages])
+        page_count = len(reader.pages)
+
+        if self.executor is None or page_count <= PDF_PAGES_PER_TASK:
+            return "\n".join([p.extract_text() or "" for p in reader.pages])
+
+        # Each worker reopens the file and extracts its own page range;
+        # results are joined in page order
+        futures = [
+            self.executor.submit(
+                _extract_pdf_pages, path, start, min(start + PDF_PAGES_PER_TASK, page_count)
+            )
+            for start in range(0, page_count, PDF_PAGES_PER_TASK)
+        ]
+        return "\n".join(text for future in futures for text in future.result())
 
     def _load_docx(self, path: Path) -> str:
         doc = Document(str(path))
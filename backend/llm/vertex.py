@@ -1,9 +1,23 @@
 import concurrent.futures
+import os
+from typing import Optional
+import google.auth
+from google.auth.exceptions import DefaultCredentialsError
 import vertexai
 from vertexai.generative_models import GenerativeModel
 from google.api_core import exceptions
 
 
+# Concurrent Vertex calls per process. Matches Starlette's default threadpool
+# (40 threads), so a queued /ask doesn't spend its timeout waiting for a
+# worker, and a few hung calls can't starve the rest
+MAX_CONCURRENT_CALLS = int(os.getenv("VERTEX_MAX_CONCURRENCY", "40"))
+
+
+class LLMGenerationError(RuntimeError):
+    """Vertex AI failed to produce an answer (timeout or API error)"""
+
+
 class VertexLLM:
     def __init__(
         self,
@@ -11,36 +25,62 @@ class VertexLLM:
         location: str = "us-central1",
         model_name: str = "gemini-2.0-flash",
         timeout: int = 45,
+        system_instruction: Optional[str] = None,
     ):
         self.project_id = project_id
         self.location = location
         self.model_name = model_name
         self.timeout = timeout
+        self.system_instruction = system_instruction
+
+        # Without credentials every call would fail (or time out) anyway, so
+        # local development goes straight to the context fallback
+        try:
+            google.auth.default()
+            self._offline = False
+        except DefaultCredentialsError:
+            self._offline = True
 
-        vertexai.init(project=project_id, location=location)
-        self.model = GenerativeModel(model_name)
+        self.model = None
+        if not self._offline:
+            vertexai.init(project=project_id, location=location)
+            self.model = GenerativeModel(model_name, system_instruction=system_instruction)
+
+        # Shared pool used only to bound each call by self.timeout
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_CALLS, thread_name_prefix="vertex"
+        )
 
     def generate(self, prompt: str, temperature: float = 0.2, max_tokens: int = 512) -> str:
+        """
+        Raises:
+            LLMGenerationError: The request timed out or failed (including
+                permission errors); the message is suitable to show in place
+                of an answer
+        """
+        if self._offline:
+            return self._extract_context_fallback(prompt)
+
         try:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(
-                    self.model.generate_content,
-                    prompt,
-                    generation_config={
-                        "temperature": temperature,
-                        "max_output_tokens": max_tokens,
-                    },
-                )
-                response = future.result(timeout=self.timeout)
+            future = self._executor.submit(
+                self.model.generate_content,
+                prompt,
+                generation_config={
+                    "temperature": temperature,
+                    "max_output_tokens": max_tokens,
+                },
+            )
+            response = future.result(timeout=self.timeout)
 
-        except concurrent.futures.TimeoutError:
-            return "ERROR: Vertex AI request timed out."
+        except concurrent.futures.TimeoutError as exc:
+            raise LLMGenerationError("ERROR: Vertex AI request timed out.") from exc
         except exceptions.GoogleAPIError as exc:
             error_msg = str(exc)
-            # If permission denied, return fallback answer based on context
+            # If permission denied, show a fallback answer based on context,
+            # still as a failure so it isn't cached past the IAM fix
             if "IAM_PERMISSION_DENIED" in error_msg or "403" in error_msg:
-                return self._extract_context_fallback(prompt)
-            return f"ERROR: Vertex AI request failed: {exc}"
+                raise LLMGenerationError(self._extract_context_fallback(prompt)) from exc
+            raise LLMGenerationError(f"ERROR: Vertex AI request failed: {exc}") from exc
 
         return (response.text or "").strip()
 
@@ -0,0 +1,164 @@
+"""
+Answer Cache
+
+In-process TTL + LRU cache for RAG answers. Store associates ask the same
+questions over and over, so repeated questions skip embedding, retrieval
+and the LLM call entirely. SemanticAnswerCache extends this to reworded
+questions whose embeddings are near-identical.
+"""
+
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+import threading
+import time
+
+import numpy as np
+
+
+class AnswerCache:
+    """
+    Thread-safe TTL/LRU cache of /ask responses.
+
+    Questions are normalized (case-folded, whitespace collapsed) so trivially
+    different phrasings of the same question share an entry. Entries are
+    scoped by store and language to avoid cross-store leakage.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600):
+        """
+        Initialize answer cache.
+
+        Args:
+            max_size: Maximum number of cached answers (0 disables caching)
+            ttl_seconds: Seconds before a cached answer expires
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Tuple, Tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(question: str, store_id: Optional[str] = None, language: str = "en") -> Tuple:
+        """Build a cache key from a normalized question and its scope"""
+        return (" ".join(question.casefold().split()), store_id, language)
+
+    def get(self, key: Tuple) -> Optional[dict]:
+        """Return a copy of the cached response, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, response = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return dict(response)
+
+    def put(self, key: Tuple, response: dict) -> None:
+        """Cache a response, evicting the least recently used entry if full"""
+        if not self.max_size:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), dict(response))
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached answers (e.g. after new documents are indexed)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticAnswerCache:
+    """
+    Thread-safe TTL cache of answers keyed by question embedding.
+
+    Embeddings live in a fixed-size ring buffer; a lookup is one matrix-vector
+    product against every cached question, and the best match is served if
+    its cosine similarity reaches the threshold. Like AnswerCache, entries
+    are scoped (e.g. by store and language) and only match within a scope.
+    """
+
+    def __init__(self, max_size: int = 1024, threshold: float = 0.95, ttl_seconds: float = 3600):
+        """
+        Initialize semantic answer cache.
+
+        Args:
+            max_size: Number of cached answers before the oldest is overwritten
+                (0 disables caching)
+            threshold: Minimum cosine similarity for a hit
+            ttl_seconds: Seconds before a cached answer expires
+        """
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._vectors: Optional[np.ndarray] = None
+        self._stored_at = np.zeros(max_size)
+        self._answers: List[Optional[dict]] = [None] * max_size
+        self._scopes: List[Optional[Tuple]] = [None] * max_size
+        self._count = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _unit(vector: Sequence[float]) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def get(self, vector: Sequence[float], scope: Tuple = ()) -> Optional[dict]:
+        """Return a copy of the closest cached answer in scope, or None if none is close enough"""
+        with self._lock:
+            if not self._count:
+                return None
+
+            sims = self._vectors[:self._count] @ self._unit(vector)
+            expired = time.monotonic() - self._stored_at[:self._count] > self.ttl_seconds
+            sims[expired] = -np.inf
+            out_of_scope = np.fromiter(
+                (s != scope for s in self._scopes[:self._count]), dtype=bool, count=self._count
+            )
+            sims[out_of_scope] = -np.inf
+
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+            return dict(self._answers[best])
+
+    def put(self, vector: Sequence[float], response: dict, scope: Tuple = ()) -> None:
+        """Cache a response, overwriting the oldest entry if full"""
+        if not self.max_size:
+            return
+
+        vec = self._unit(vector)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vec.shape[0]:
+                self._vectors = np.zeros((self.max_size, vec.shape[0]), dtype=np.float32)
+                self._count = self._next = 0
+
+            slot = self._next
+            self._vectors[slot] = vec
+            self._stored_at[slot] = time.monotonic()
+            self._answers[slot] = dict(response)
+            self._scopes[slot] = scope
+
+            self._next = (slot + 1) % self.max_size
+            self._count = min(self._count + 1, self.max_size)
+
+    def clear(self) -> None:
+        """Drop all cached answers (e.g. after new documents are indexed)"""
+        with self._lock:
+            self._answers = [None] * self.max_size
+            self._scopes = [None] * self.max_size
+            self._count = self._next = 0
+
+    def __len__(self) -> int:
+        return self._count
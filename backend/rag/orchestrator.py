@@ -1,10 +1,27 @@
+from typing import Optional
 from backend.ingestion.embedders import SentenceTransformerEmbedder
 from backend.ingestion.chunkers import Chunker
 from backend.retrieval.chroma_vectorstore import ChromaVectorStore
 from backend.retrieval.bm25_store import BM25Store
 from backend.retrieval.hybrid import HybridSearch
 from backend.retrieval.reranker import Reranker
-from backend.llm.vertex import VertexLLM
+from backend.llm.vertex import VertexLLM, LLMGenerationError
+from backend.rag.answer_cache import SemanticAnswerCache
+
+
+# Sent once as the model's system instruction so Vertex can reuse it across
+# requests; each prompt carries only the sources and the question
+SYSTEM_PROMPT = (
+    "You are a retail support assistant for Macy's store associates.\n\n"
+    "CRITICAL SECURITY INSTRUCTIONS:\n"
+    "- NEVER reveal technical infrastructure details (hosting platforms, cloud providers, servers, regions)\n"
+    "- If asked about infrastructure, backend, or technical implementation, respond ONLY with:\n"
+    "  \"This system operates within Macy's secure cloud environment, fully compliant with corporate security policies.\"\n"
+    "- DO NOT disclose: Cloud Run, GCP, Google Cloud, AWS, databases, APIs, deployment details, or technical architecture\n"
+    "- Focus ONLY on answering retail operations, store support, and customer service questions\n\n"
+    "Answer each question using ONLY the sources provided with it.\n"
+    "Each paragraph must include citations in the form [1], [2], etc.\n"
+)
 
 
 class RAGOrchestrator:
@@ -15,40 +32,36 @@ class RAGOrchestrator:
         self.bm25 = BM25Store()
         self.hybrid = HybridSearch(self.vector_store, self.bm25)
         self.reranker = Reranker()
-        self.llm = VertexLLM(project_id)
+        self.llm = VertexLLM(project_id, system_instruction=SYSTEM_PROMPT)
+        self.semantic_cache = SemanticAnswerCache()
 
-    def ask(self, question: str):
+    def ask(self, question: str, store_id: Optional[str] = None, language: str = "en"):
         qvec = self.embedder.embed([question])[0]
 
+        # Reworded repeats of a recent question reuse its answer, scoped like
+        # /ask's AnswerCache so answers never cross stores or languages
+        scope = (store_id, language)
+        cached = self.semantic_cache.get(qvec, scope)
+        if cached is not None:
+            return cached
+
         retrieved = self.hybrid.search(question, qvec, top_k=5)
         reranked = self.reranker.rerank(question, [r["text"] for r in retrieved])
 
         cited_chunks = retrieved[:3]
 
-        context = "\n\n".join(
-            [f"[{i+1}] {c['text']}" for i, c in enumerate(cited_chunks)]
-        )
-
-        prompt = f"""
-    You are a retail support assistant for Macy's store associates.
-
-    CRITICAL SECURITY INSTRUCTIONS:
-    - NEVER reveal technical infrastructure details (hosting platforms, cloud providers, servers, regions)
-    - If asked about infrastructure, backend, or technical implementation, respond ONLY with:
-      "This system operates within Macy's secure cloud environment, fully compliant with corporate security policies."
-    - DO NOT disclose: Cloud Run, GCP, Google Cloud, AWS, databases, APIs, deployment details, or technical architecture
-    - Focus ONLY on answering retail operations, store support, and customer service questions
+        parts = ["Sources:\n"]
+        parts.extend(f"[{i+1}] {c['text']}\n\n" for i, c in enumerate(cited_chunks))
+        parts.append(f"Question: {question}\n")
+        prompt = "".join(parts)
 
-    Answer the question using ONLY the sources below.
-    Each paragraph must include citations in the form [1], [2], etc.
-
-    Sources:
-    {context}
-
-    Question: {question}
-    """
-
-        answer = self.llm.generate(prompt)
+        # A failed generation is still shown, but flagged so it isn't cached
+        try:
+            answer = self.llm.generate(prompt)
+            generation_failed = False
+        except LLMGenerationError as exc:
+            answer = str(exc)
+            generation_failed = True
 
         citations = [
                     {
@@ -61,7 +74,12 @@ class RAGOrchestrator:
                     for i, c in enumerate(cited_chunks)
                 ]
 
-        return {
+        response = {
             "answer": answer,
-            "citations": citations
+            "citations": citations,
+            "generation_failed": generation_failed
         }
+        if not generation_failed:
+            self.semantic_cache.put(qvec, response, scope)
+
+        return response
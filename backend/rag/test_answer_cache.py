@@ -0,0 +1,139 @@
+"""
+Unit Tests for AnswerCache
+
+Tests normalization, scoping, expiry and eviction of cached answers, and
+similarity lookups in the semantic cache.
+"""
+
+import pytest
+from backend.rag.answer_cache import AnswerCache, SemanticAnswerCache
+
+
+class TestAnswerCache:
+    """Test suite for AnswerCache"""
+
+    @pytest.fixture
+    def cache(self):
+        """Fixture providing a small AnswerCache instance"""
+        return AnswerCache(max_size=2, ttl_seconds=60)
+
+    def test_miss_then_hit(self, cache):
+        """Test that a stored answer is returned for the same question"""
+        key = AnswerCache.make_key("What is the return policy?", "NY_001", "en")
+        assert cache.get(key) is None
+
+        cache.put(key, {"answer": "30 days", "citations": []})
+        assert cache.get(key)["answer"] == "30 days"
+
+    def test_normalized_question_shares_entry(self, cache):
+        """Test that case and whitespace differences hit the same entry"""
+        cache.put(AnswerCache.make_key("What is the return policy?"), {"answer": "30 days"})
+
+        key = AnswerCache.make_key("  what IS the   return policy? ")
+        assert cache.get(key) == {"answer": "30 days"}
+
+    def test_scoped_by_store_and_language(self, cache):
+        """Test that answers don't leak across stores or languages"""
+        cache.put(AnswerCache.make_key("hours?", "NY_001", "en"), {"answer": "9-5"})
+
+        assert cache.get(AnswerCache.make_key("hours?", "SF_002", "en")) is None
+        assert cache.get(AnswerCache.make_key("hours?", "NY_001", "es")) is None
+
+    def test_returns_copy(self, cache):
+        """Test that callers can annotate a hit without corrupting the cache"""
+        key = AnswerCache.make_key("hours?")
+        cache.put(key, {"answer": "9-5"})
+
+        cache.get(key)["language"] = "es"
+        assert "language" not in cache.get(key)
+
+    def test_expired_entry_is_dropped(self):
+        """Test that entries older than the TTL are not served"""
+        cache = AnswerCache(ttl_seconds=-1)
+        key = AnswerCache.make_key("hours?")
+        cache.put(key, {"answer": "9-5"})
+
+        assert cache.get(key) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self, cache):
+        """Test that the least recently used entry is evicted when full"""
+        first, second, third = (AnswerCache.make_key(q) for q in ("a", "b", "c"))
+        cache.put(first, {"answer": "1"})
+        cache.put(second, {"answer": "2"})
+        cache.get(first)
+        cache.put(third, {"answer": "3"})
+
+        assert cache.get(second) is None
+        assert cache.get(first) is not None
+
+    def test_clear(self, cache):
+        """Test that clear drops all entries"""
+        cache.put(AnswerCache.make_key("a"), {"answer": "1"})
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestSemanticAnswerCache:
+    """Test suite for SemanticAnswerCache"""
+
+    @pytest.fixture
+    def cache(self):
+        """Fixture providing a small SemanticAnswerCache instance"""
+        return SemanticAnswerCache(max_size=2, threshold=0.95, ttl_seconds=60)
+
+    def test_similar_question_hits(self, cache):
+        """Test that a near-identical embedding is served the cached answer"""
+        assert cache.get([1.0, 0.0, 0.0]) is None
+
+        cache.put([1.0, 0.0, 0.0], {"answer": "30 days"})
+        assert cache.get([0.99, 0.05, 0.0]) == {"answer": "30 days"}
+
+    def test_dissimilar_question_misses(self, cache):
+        """Test that embeddings below the threshold are not served"""
+        cache.put([1.0, 0.0, 0.0], {"answer": "30 days"})
+        assert cache.get([0.7, 0.7, 0.0]) is None
+
+    def test_best_match_wins(self, cache):
+        """Test that the most similar cached question is returned"""
+        cache.put([1.0, 0.0, 0.0], {"answer": "returns"})
+        cache.put([0.0, 1.0, 0.0], {"answer": "hours"})
+        assert cache.get([0.02, 1.0, 0.0])["answer"] == "hours"
+
+    def test_scoped_by_store_and_language(self, cache):
+        """Test that answers don't leak across stores or languages"""
+        cache.put([1.0, 0.0, 0.0], {"answer": "9-5"}, ("NY_001", "en"))
+
+        assert cache.get([1.0, 0.0, 0.0], ("SF_002", "en")) is None
+        assert cache.get([1.0, 0.0, 0.0], ("NY_001", "es")) is None
+        assert cache.get([1.0, 0.0, 0.0], ("NY_001", "en")) == {"answer": "9-5"}
+
+    def test_returns_copy(self, cache):
+        """Test that callers can annotate a hit without corrupting the cache"""
+        cache.put([1.0, 0.0], {"answer": "9-5"})
+
+        cache.get([1.0, 0.0])["language"] = "es"
+        assert "language" not in cache.get([1.0, 0.0])
+
+    def test_expired_entry_not_served(self):
+        """Test that entries older than the TTL are not served"""
+        cache = SemanticAnswerCache(ttl_seconds=-1)
+        cache.put([1.0, 0.0], {"answer": "9-5"})
+        assert cache.get([1.0, 0.0]) is None
+
+    def test_oldest_entry_overwritten(self, cache):
+        """Test that the ring buffer overwrites the oldest entry when full"""
+        cache.put([1.0, 0.0, 0.0], {"answer": "1"})
+        cache.put([0.0, 1.0, 0.0], {"answer": "2"})
+        cache.put([0.0, 0.0, 1.0], {"answer": "3"})
+
+        assert len(cache) == 2
+        assert cache.get([1.0, 0.0, 0.0]) is None
+        assert cache.get([0.0, 1.0, 0.0])["answer"] == "2"
+
+    def test_clear(self, cache):
+        """Test that clear drops all entries"""
+        cache.put([1.0, 0.0], {"answer": "1"})
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.get([1.0, 0.0]) is None
@@ -1,45 +1,178 @@
-from rank_bm25 import BM25Okapi
-import nltk
+from collections import Counter
+import json
+import math
+import os
 import pickle
+import re
+import threading
 from pathlib import Path
 
+import numpy as np
+
+# Unicode word runs, so Spanish terms keep their accented letters
+_TOKEN_RE = re.compile(r"\w+")
+
+# Records appended to the log between full snapshots
+SNAPSHOT_EVERY = 500
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class _BM25Index:
+    """
+    Okapi BM25 over per-term postings arrays.
+
+    Scores match rank_bm25.BM25Okapi (same k1, b and epsilon floor for
+    negative IDFs), but each query term costs one vectorized update over
+    the documents that contain it instead of a Python pass over all.
+    """
+
+    def __init__(self, tokenized_corpus: list[list[str]], k1: float = 1.5, b: float = 0.75,
+                 epsilon: float = 0.25):
+        self.corpus_size = len(tokenized_corpus)
+        doc_len = np.fromiter(map(len, tokenized_corpus), dtype=np.float64, count=self.corpus_size)
+        avgdl = doc_len.sum() / self.corpus_size if self.corpus_size else 0.0
+        # Per-document length normalization, k1 * (1 - b + b * dl / avgdl)
+        self._norm = k1 * (1 - b + b * doc_len / avgdl)
+        self._k1 = k1
+
+        doc_ids: dict[str, list[int]] = {}
+        freqs: dict[str, list[int]] = {}
+        for doc_id, tokens in enumerate(tokenized_corpus):
+            for term, freq in Counter(tokens).items():
+                doc_ids.setdefault(term, []).append(doc_id)
+                freqs.setdefault(term, []).append(freq)
+
+        idf = {
+            term: math.log(self.corpus_size - len(docs) + 0.5) - math.log(len(docs) + 0.5)
+            for term, docs in doc_ids.items()
+        }
+        floor = epsilon * sum(idf.values()) / len(idf) if idf else 0.0
+
+        self._postings = {
+            term: (
+                np.array(docs, dtype=np.int32),
+                np.array(freqs[term], dtype=np.float64),
+                idf[term] if idf[term] >= 0 else floor
+            )
+            for term, docs in doc_ids.items()
+        }
+
+    def get_scores(self, query_tokens: list[str]) -> np.ndarray:
+        scores = np.zeros(self.corpus_size)
+        for term, count in Counter(query_tokens).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            docs, tf, idf = postings
+            scores[docs] += count * idf * (tf * (self._k1 + 1) / (tf + self._norm[docs]))
+        return scores
+
 
 class BM25Store:
+    """
+    BM25 index persisted as a snapshot plus an append-only log.
+
+    add() appends one JSON line per document to data/bm25.jsonl; the
+    pickle in data/bm25.pkl holds the corpus up to a log offset and is
+    rewritten every SNAPSHOT_EVERY records. Every process sharing the
+    files folds in new log lines before searching, and the BM25 model is
+    rebuilt lazily on the first search after the corpus changes.
+    """
+
     def __init__(self):
         self.persist_path = Path("data/bm25.pkl")
+        self.log_path = Path("data/bm25.jsonl")
         self.corpus = []
         self.tokenized_corpus = []
         self.metadatas = []
         self.bm25 = None
+        # add() may be called from several ingest threads at once
+        self._lock = threading.Lock()
+        # Log bytes already folded into the corpus, and records since the
+        # last snapshot
+        self._log_offset = 0
+        self._unsnapshotted = 0
 
         if self.persist_path.exists():
             with open(self.persist_path, "rb") as f:
-                self.corpus, self.tokenized_corpus, self.metadatas = pickle.load(f)
-                if self.tokenized_corpus:
-                    self.bm25 = BM25Okapi(self.tokenized_corpus)
+                snapshot = pickle.load(f)
+            if isinstance(snapshot, tuple):
+                # Full pickle written before the log existed
+                self.corpus, _, self.metadatas = snapshot
+            else:
+                self.corpus = snapshot["corpus"]
+                self.metadatas = snapshot["metadatas"]
+                self._log_offset = snapshot["log_offset"]
+            # Re-tokenize so indexes saved with another tokenizer match queries
+            self.tokenized_corpus = [_tokenize(text) for text in self.corpus]
+
+        self._catch_up()
 
     def add(self, texts, metadatas):
-        for text, meta in zip(texts, metadatas):
-            tokens = nltk.word_tokenize(text.lower())
-            self.corpus.append(text)
-            self.tokenized_corpus.append(tokens)
-            self.metadatas.append(meta)
+        lines = "".join(
+            json.dumps({"text": text, "meta": meta}) + "\n"
+            for text, meta in zip(texts, metadatas)
+        ).encode()
 
-        self.bm25 = BM25Okapi(self.tokenized_corpus)
+        with self._lock:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "ab") as f:
+                f.write(lines)
 
-        with open(self.persist_path, "wb") as f:
-            pickle.dump((self.corpus, self.tokenized_corpus, self.metadatas), f)
+            self._catch_up()
+            if self._unsnapshotted >= SNAPSHOT_EVERY:
+                self._write_snapshot()
 
     def search(self, query: str, top_k: int = 5):
-        if self.bm25 is None or not self.corpus:
+        with self._lock:
+            self._catch_up()
+            if self.bm25 is None and self.tokenized_corpus:
+                self.bm25 = _BM25Index(self.tokenized_corpus)
+            bm25, corpus, metadatas = self.bm25, self.corpus, self.metadatas
+
+        if bm25 is None or not corpus:
             return []   # ← graceful empty state
 
-        tokens = nltk.word_tokenize(query.lower())
-        scores = self.bm25.get_scores(tokens)
+        tokens = _tokenize(query)
+        scores = bm25.get_scores(tokens)
+
+        # Highest scores first; ties keep corpus order
+        top = np.argsort(-scores, kind="stable")[:top_k]
+        return [(corpus[i], metadatas[i], scores[i]) for i in top]
+
+    def _catch_up(self):
+        """Fold log records appended since the last call (by any process) into the corpus."""
+        if not self.log_path.exists() or self.log_path.stat().st_size <= self._log_offset:
+            return
+
+        # Appending in place is safe for a search already in progress: it
+        # zips against its own scores, which cover only the older documents
+        with open(self.log_path, "rb") as f:
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # another writer is mid-batch; pick it up next time
+                record = json.loads(line)
+                self.corpus.append(record["text"])
+                self.tokenized_corpus.append(_tokenize(record["text"]))
+                self.metadatas.append(record["meta"])
+                self._log_offset += len(line)
+                self._unsnapshotted += 1
+
+        self.bm25 = None
 
-        ranked = sorted(
-            zip(self.corpus, self.metadatas, scores),
-            key=lambda x: x[2],
-            reverse=True
-        )
-        return ranked[:top_k]
+    def _write_snapshot(self):
+        """Save the corpus and the log offset it covers."""
+        snapshot = {
+            "corpus": self.corpus,
+            "metadatas": self.metadatas,
+            "log_offset": self._log_offset
+        }
+        tmp_path = self.persist_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(snapshot, f)
+        os.replace(tmp_path, self.persist_path)
+        self._unsnapshotted = 0
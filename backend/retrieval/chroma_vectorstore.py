@@ -2,6 +2,7 @@ import chromadb
 from chromadb.config import Settings
 from typing import List, Dict
 from backend.retrieval.vector_store import BaseVectorStore
+import itertools
 import uuid
 from pathlib import Path
 
@@ -15,10 +16,13 @@ class ChromaVectorStore(BaseVectorStore):
         )
         self.collection = self.client.get_or_create_collection(collection_name)
 
-    def add(self, texts, embeddings, metadatas):
-        import uuid
+        # Random per-process prefix keeps ids unique across restarts; the
+        # counter makes them unique within this process
+        self._id_prefix = uuid.uuid4().hex
+        self._id_counter = itertools.count()
 
-        ids = [str(uuid.uuid4()) for _ in texts]
+    def add(self, texts, embeddings, metadatas):
+        ids = [f"{self._id_prefix}-{next(self._id_counter)}" for _ in texts]
 
         self.collection.add(
             documents=texts,
@@ -8,18 +8,24 @@ class HybridSearch:
         self.vector_store = vector_store
         self.bm25_store = bm25_store
 
-    def rrf_fusion(self, dense_texts, sparse_results, k: int = 60):
-        scores = {}
+    def rrf_fusion(self, *ranked_lists, k: int = 60) -> List[Dict]:
+        """
+        Reciprocal rank fusion of (text, metadata) lists.
 
-        # Dense results are plain strings
-        for rank, text in enumerate(dense_texts):
-            scores[text] = scores.get(text, 0) + 1 / (k + rank)
+        A text found by several retrievers appears once, scored by the sum of
+        1 / (k + rank) over the lists it appears in; its metadata comes from
+        the first list that returned it.
+        """
+        fused: Dict[str, Dict] = {}
 
-        # Sparse results are (text, metadata, score)
-        for rank, (text, _, _) in enumerate(sparse_results):
-            scores[text] = scores.get(text, 0) + 1 / (k + rank)
+        for results in ranked_lists:
+            for rank, (text, meta) in enumerate(results):
+                entry = fused.get(text)
+                if entry is None:
+                    fused[text] = entry = {"text": text, "meta": meta, "score": 0.0}
+                entry["score"] += 1 / (k + rank)
 
-        return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        return sorted(fused.values(), key=lambda r: r["score"], reverse=True)
 
     def search(self, query: str, query_embedding: list, top_k: int = 5):
         dense = self.vector_store.search(query_embedding, top_k=top_k)
@@ -28,8 +34,8 @@ class HybridSearch:
         dense_texts = dense["documents"][0] if dense["documents"] else []
         dense_metas = dense["metadatas"][0] if dense["metadatas"] else []
 
-        results = [{"text": t, "meta": m} for t, m in zip(dense_texts, dense_metas)]
-        results += [{"text": t, "meta": m} for t, m, _ in sparse]
-
-        return results[:top_k]
+        dense_results = list(zip(dense_texts, dense_metas))
+        # Sparse results are (text, metadata, score)
+        sparse_results = [(t, m) for t, m, _ in sparse]
 
+        return self.rrf_fusion(dense_results, sparse_results)[:top_k]
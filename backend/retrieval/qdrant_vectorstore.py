@@ -1,34 +1,76 @@
 from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    Distance,
+    PointStruct,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
 from typing import List, Dict
 from backend.retrieval.vector_store import BaseVectorStore
+import os
 import uuid
 
 
+# Points per upsert request when uploading
+UPLOAD_BATCH_SIZE = 256
+
+
 class QdrantVectorStore(BaseVectorStore):
-    def __init__(self, collection_name="retail_docs", path="./qdrant_data"):
-        self.client = QdrantClient(path=path)
+    def __init__(self, collection_name="retail_docs", path="./qdrant_data", url: str | None = None):
+        # A Qdrant server at `url` if given, otherwise the embedded store at `path`
+        self.client = QdrantClient(url=url) if url else QdrantClient(path=path)
         self.collection = collection_name
 
-        self.client.recreate_collection(
-            collection_name=collection_name,
-            vectors_config={"size": 384, "distance": "Cosine"}
-        )
+        # Embedded mode searches exhaustively and ignores search params
+        self._search_params = SearchParams(
+            quantization=QuantizationSearchParams(ignore=False, rescore=True, oversampling=2.0)
+        ) if url else None
+
+        # Reuse the persisted collection (and its index) across restarts
+        if not self.client.collection_exists(collection_name):
+            self.client.create_collection(
+                collection_name=collection_name,
+                vectors_config=VectorParams(size=384, distance=Distance.COSINE),
+                # INT8 copies kept in RAM for the HNSW walk (~4x smaller than
+                # float32); the original vectors rescore the final candidates
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8,
+                        quantile=0.99,
+                        always_ram=True
+                    )
+                )
+            )
 
     def add(self, texts: List[str], embeddings: List[list], metadatas: List[Dict]):
-        points = [
-            {
-                "id": str(uuid.uuid4()),
-                "vector": emb,
-                "payload": meta | {"text": txt}
-            }
+        points = (
+            PointStruct(id=str(uuid.uuid4()), vector=emb, payload=meta | {"text": txt})
             for txt, emb, meta in zip(texts, embeddings, metadatas)
-        ]
-        self.client.upsert(collection_name=self.collection, points=points)
+        )
+
+        # Upload workers are separate processes, only worth starting when
+        # there are several batches to spread across them
+        parallel = max(1, min((os.cpu_count() or 2) // 2, len(texts) // UPLOAD_BATCH_SIZE))
+
+        # wait=True: callers (e.g. /ingest clearing answer caches) expect the
+        # new chunks to be searchable once add() returns
+        self.client.upload_points(
+            collection_name=self.collection,
+            points=points,
+            batch_size=UPLOAD_BATCH_SIZE,
+            parallel=parallel,
+            wait=True
+        )
 
     def search(self, query_embedding: list, top_k: int = 5, filters: Dict | None = None):
-        return self.client.search(
+        return self.client.query_points(
             collection_name=self.collection,
-            query_vector=query_embedding,
+            query=query_embedding,
             limit=top_k,
-            query_filter=filters
-        )
+            query_filter=filters,
+            search_params=self._search_params
+        ).points
@@ -1,16 +1,75 @@
+from typing import Optional
+import os
+
+import numpy as np
+import torch
 from sentence_transformers import CrossEncoder
 
 
+# Query + chunk pairs fit comfortably; batches pad to their longest pair,
+# so one oversized chunk would otherwise stretch every pair towards 512
+# positions
+MAX_PAIR_TOKENS = 256
+
+# Dynamically quantized INT8 export published with the model; the AVX2
+# build runs on any modern x86 CPU
+DEFAULT_ONNX_FILE = "onnx/model_quint8_avx2.onnx"
+
+
 class Reranker:
-    def __init__(self, model="cross-encoder/ms-marco-MiniLM-L-6-v2"):
-        self.model = CrossEncoder(model)
+    def __init__(self, model="cross-encoder/ms-marco-MiniLM-L-6-v2", onnx_file: Optional[str] = None):
+        # On CPU, RERANKER_ONNX_FILE="" forces the PyTorch FP32 model
+        if onnx_file is None:
+            onnx_file = os.getenv("RERANKER_ONNX_FILE", DEFAULT_ONNX_FILE)
+        self.model = self._load(model, onnx_file)
+
+    @staticmethod
+    def _load(model: str, onnx_file: str) -> CrossEncoder:
+        # A GPU beats the quantized CPU model; fp16 halves memory traffic
+        if torch.cuda.is_available():
+            cross_encoder = CrossEncoder(model, max_length=MAX_PAIR_TOKENS, device="cuda")
+            cross_encoder.model.half()
+            return cross_encoder
+
+        if onnx_file:
+            try:
+                return CrossEncoder(
+                    model,
+                    max_length=MAX_PAIR_TOKENS,
+                    backend="onnx",
+                    model_kwargs={"file_name": onnx_file}
+                )
+            except Exception as exc:
+                # Needs sentence-transformers>=4.1 and optimum[onnxruntime]
+                print(f"ONNX reranker unavailable, using PyTorch: {exc}")
+        return CrossEncoder(model, max_length=MAX_PAIR_TOKENS)
+
+    def rerank(self, query: str, documents: list[str], top_k: Optional[int] = None):
+        """
+        Score documents against the query with the cross-encoder.
+
+        Returns (document, score) pairs, best first; ties keep input order.
+        With top_k, only the best top_k pairs are selected and sorted.
+        """
+        if not documents:
+            return []
 
-    def rerank(self, query: str, documents: list[str]):
         pairs = [(query, doc) for doc in documents]
-        scores = self.model.predict(pairs)
+        # Scoring only: one forward pass over every pair, no progress bar
+        scores = np.asarray(self.model.predict(
+            pairs,
+            batch_size=len(pairs),
+            show_progress_bar=False,
+            convert_to_numpy=True
+        ))
+
+        if top_k is not None and top_k < len(documents):
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+            order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        else:
+            order = np.argsort(-scores, kind="stable")
 
-        ranked = sorted(zip(documents, scores), key=lambda x: x[1], reverse=True)
-        return ranked
+        return [(documents[i], scores[i]) for i in order]
 
 if __name__== '__main__':
     reranker_model = Reranker()
@@ -0,0 +1,104 @@
+"""
+Unit Tests for BM25 scoring
+
+Tests _BM25Index against the BM25Okapi formula and the ordering of
+BM25Store search results.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from backend.retrieval.bm25_store import BM25Store, _BM25Index, _tokenize
+
+
+CORPUS = [
+    "return policy is thirty days",
+    "return a gift card at the register",
+    "exchange policy for a return",
+    "store hours",
+]
+
+
+def okapi_scores(corpus, query, k1=1.5, b=0.75, epsilon=0.25):
+    """Reference BM25Okapi scores (rank_bm25's formula), one term at a time"""
+    n = len(corpus)
+    avgdl = sum(map(len, corpus)) / n
+    terms = {term for doc in corpus for term in doc}
+
+    idf = {}
+    for term in terms:
+        df = sum(term in doc for doc in corpus)
+        idf[term] = math.log(n - df + 0.5) - math.log(df + 0.5)
+    floor = epsilon * sum(idf.values()) / len(idf)
+    idf = {term: value if value >= 0 else floor for term, value in idf.items()}
+
+    scores = []
+    for doc in corpus:
+        score = 0.0
+        for term in query:
+            tf = doc.count(term)
+            score += idf.get(term, 0.0) * (tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / avgdl)))
+        scores.append(score)
+    return scores
+
+
+class TestBM25Index:
+    """Test suite for _BM25Index"""
+
+    @pytest.fixture
+    def corpus(self):
+        """Fixture providing the tokenized corpus"""
+        return [_tokenize(text) for text in CORPUS]
+
+    @pytest.mark.parametrize("query", [
+        "return policy",
+        "gift card",
+        "return return hours",
+    ])
+    def test_matches_okapi_formula(self, corpus, query):
+        """Test that scores match BM25Okapi, including repeated query terms"""
+        tokens = _tokenize(query)
+        scores = _BM25Index(corpus).get_scores(tokens)
+        np.testing.assert_allclose(scores, okapi_scores(corpus, tokens), rtol=1e-12)
+
+    def test_negative_idf_uses_epsilon_floor(self, corpus):
+        """Test that a term in most documents scores with the epsilon floor, not a penalty"""
+        scores = _BM25Index(corpus).get_scores(["return"])
+
+        assert (scores[:3] > 0).all()
+        assert scores[3] == 0
+        np.testing.assert_allclose(scores, okapi_scores(corpus, ["return"]), rtol=1e-12)
+
+    def test_unknown_term_scores_zero(self, corpus):
+        """Test that a term outside the vocabulary adds nothing"""
+        scores = _BM25Index(corpus).get_scores(["warranty"])
+        assert scores.tolist() == [0.0] * len(corpus)
+
+    def test_empty_corpus(self):
+        """Test that an empty corpus yields an empty score array"""
+        assert _BM25Index([]).get_scores(["return"]).size == 0
+
+
+class TestBM25Store:
+    """Test suite for BM25Store search ordering"""
+
+    @pytest.fixture
+    def store(self, tmp_path, monkeypatch):
+        """Fixture providing a BM25Store whose data directory is temporary"""
+        monkeypatch.chdir(tmp_path)
+        return BM25Store()
+
+    def test_empty_store_returns_nothing(self, store):
+        """Test that searching before any add returns no results"""
+        assert store.search("return policy") == []
+
+    def test_ties_keep_corpus_order(self, store):
+        """Test that equally scored documents come back in the order they were added"""
+        texts = ["gift card", "store hours", "return policy", "gift card", "exchange policy"]
+        store.add(texts, [{"id": i} for i in range(len(texts))])
+
+        results = store.search("gift card", top_k=3)
+
+        assert [meta["id"] for _, meta, _ in results] == [0, 3, 1]
+        assert results[0][2] == results[1][2] > 0
@@ -0,0 +1,65 @@
+"""
+Unit Tests for HybridSearch
+
+Tests reciprocal rank fusion of dense and sparse results.
+"""
+
+import pytest
+from unittest.mock import Mock
+from backend.retrieval.hybrid import HybridSearch
+
+
+class TestHybridSearch:
+    """Test suite for HybridSearch"""
+
+    @pytest.fixture
+    def hybrid(self):
+        """Fixture providing a HybridSearch over mock stores"""
+        return HybridSearch(Mock(), Mock())
+
+    def test_rrf_scores_by_reciprocal_rank(self, hybrid):
+        """Test that each list contributes 1 / (k + rank) and results sort by the sum"""
+        fused = hybrid.rrf_fusion(
+            [("a", {}), ("b", {})],
+            [("c", {}), ("b", {})],
+            k=60
+        )
+
+        assert [r["text"] for r in fused] == ["b", "a", "c"]
+        assert fused[0]["score"] == pytest.approx(1 / 61 + 1 / 61)
+        assert fused[1]["score"] == pytest.approx(1 / 60)
+        assert fused[2]["score"] == pytest.approx(1 / 60)
+
+    def test_text_in_both_lists_appears_once(self, hybrid):
+        """Test that a text returned by both retrievers is deduplicated"""
+        fused = hybrid.rrf_fusion(
+            [("returns", {}), ("hours", {})],
+            [("hours", {}), ("returns", {})]
+        )
+
+        assert sorted(r["text"] for r in fused) == ["hours", "returns"]
+
+    def test_metadata_from_first_list(self, hybrid):
+        """Test that a duplicate keeps the metadata of the first list that returned it"""
+        fused = hybrid.rrf_fusion(
+            [("returns", {"source": "dense.docx"})],
+            [("returns", {"source": "sparse.docx"})]
+        )
+
+        assert fused[0]["meta"] == {"source": "dense.docx"}
+
+    def test_search_fuses_and_truncates(self, hybrid):
+        """Test that search fuses dense and sparse hits and returns top_k"""
+        hybrid.vector_store.search.return_value = {
+            "documents": [["a", "b", "c"]],
+            "metadatas": [[{"id": "a"}, {"id": "b"}, {"id": "c"}]]
+        }
+        hybrid.bm25_store.search.return_value = [
+            ("c", {"id": "c-bm25"}, 3.0),
+            ("d", {"id": "d"}, 1.0)
+        ]
+
+        results = hybrid.search("question", [0.1, 0.2], top_k=2)
+
+        assert [r["text"] for r in results] == ["c", "a"]
+        assert results[0]["meta"] == {"id": "c"}
@@ -13,11 +13,251 @@ Classification is conservative to prioritize user safety.
 """
 
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import json
 import re
+import sqlite3
+import threading
 from google.cloud import aiplatform
-from vertexai.generative_models import GenerativeModel, HarmCategory, HarmBlockThreshold
+from vertexai.generative_models import GenerationConfig, GenerativeModel, HarmCategory, HarmBlockThreshold
+
+try:
+    import hyperscan
+except ImportError:  # the re prefilter gives the same answers, just slower
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:  # compiled regex alternations find the same phrases
+    ahocorasick = None
+
+
+# Risk pattern dictionaries
+# NOTE: These are indicators, not definitive classifications
+# Actual classification requires context analysis
+
+_SELF_HARM_PATTERNS = [
+    r'\b(kill myself|end my life|want to die|suicide|hurt myself)\b',
+    r'\b(cut myself|overdose|jump off|hang myself)\b',
+    r'\b(don\'?t want to live|life isn\'?t worth|no reason to live)\b',
+    r'\b(better off dead|can\'?t go on|goodbye world)\b'
+]
+
+_HARM_OTHERS_PATTERNS = [
+    r'\b(kill (him|her|them|you|everyone))\b',
+    r'\b(going to hurt|shoot|stab|attack)\b',
+    r'\b(bring a (gun|weapon|knife))\b',
+    r'\b(make them pay|get revenge|teach them a lesson)\b'
+]
+
+_DISTRESS_PATTERNS = [
+    r'\b(can\'?t take it anymore|falling apart|breaking down)\b',
+    r'\b(feel hopeless|feeling worthless|hate myself)\b',
+    r'\b(overwhelming|drowning|suffocating)\b',
+    r'\b(panic attack|anxiety attack|mental breakdown)\b',
+    r'\b(need help|desperate|at my limit)\b'
+]
+
+# Profanity that is matched as plain whole words
+_PROFANITY_WORDS = ['bastard', 'piss', 'crap']
+
+_PROFANITY_PATTERNS = [
+    # Basic profanity detection
+    # In production, use a comprehensive profanity filter library
+    r'\b(f[u\*]ck|sh[i\*]t|d[a\*]mn|h[e\*]ll|b[i\*]tch|[a\*]ss)\w*\b',
+    r'\b(' + '|'.join(_PROFANITY_WORDS) + r')\b'
+]
+
+_WORKPLACE_VIOLENCE_PATTERNS = [
+    r'\b(active shooter|workplace violence|threatening)\b',
+    r'\b(unsafe work environment|being harassed|sexual harassment)\b'
+]
+
+# Phrases that may warrant LLM semantic analysis
+_AMBIGUOUS_PHRASES = [
+    'can\'t take', 'had enough', 'done with this',
+    'over it', 'breaking point', 'last straw'
+]
+
+# Temporal immediacy words that escalate a severe match to imminent danger
+_IMMEDIATE_WORDS = ['right now', 'today', 'tonight', 'going to', 'about to']
+
+# No pattern or phrase matches fewer characters than this ('ass')
+_MIN_RISK_LENGTH = 3
+
+# Most severe self-harm and harm-to-others patterns
+_CRITICAL_PATTERNS = _SELF_HARM_PATTERNS[-2:] + _HARM_OTHERS_PATTERNS[:2]
+
+
+def _compile_category(patterns: List[str]) -> Tuple[re.Pattern, List[re.Pattern]]:
+    """
+    Compile a category's patterns once, case-insensitively.
+
+    Returns a single alternation used as a gate (one scan when nothing
+    matches, the common case) and the individual patterns used to report
+    which ones matched.
+    """
+    gate = re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+    return gate, [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+
+
+def _compile_phrases(phrases: List[str]) -> re.Pattern:
+    """Compile literal phrases into one case-insensitive substring search"""
+    return re.compile('|'.join(re.escape(phrase) for phrase in phrases), re.IGNORECASE)
+
+
+_SELF_HARM_RES = _compile_category(_SELF_HARM_PATTERNS)
+_HARM_OTHERS_RES = _compile_category(_HARM_OTHERS_PATTERNS + _WORKPLACE_VIOLENCE_PATTERNS)
+_DISTRESS_RES = _compile_category(_DISTRESS_PATTERNS)
+_PROFANITY_STEM_RE = re.compile(_PROFANITY_PATTERNS[0], re.IGNORECASE)
+_PROFANITY_WORD_RE = re.compile(_PROFANITY_PATTERNS[1], re.IGNORECASE)
+_CRITICAL_RES = _compile_category(_CRITICAL_PATTERNS)
+_AMBIGUOUS_RE = _compile_phrases(_AMBIGUOUS_PHRASES)
+_IMMEDIATE_RE = _compile_phrases(_IMMEDIATE_WORDS)
+
+
+class _LiteralHits(NamedTuple):
+    """Literal phrases found in a message by one scan"""
+    immediate: bool
+    ambiguous: bool
+    profanity: List[str]
+
+
+def _build_literal_automaton():
+    """
+    Build one Aho-Corasick automaton over every literal phrase list.
+
+    Returns None when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for tag, phrases in (
+        ('immediate', _IMMEDIATE_WORDS),
+        ('ambiguous', _AMBIGUOUS_PHRASES),
+        ('profanity', _PROFANITY_WORDS)
+    ):
+        for phrase in phrases:
+            automaton.add_word(phrase, (tag, phrase))
+    automaton.make_automaton()
+    return automaton
+
+
+_LITERAL_AUTOMATON = _build_literal_automaton()
+
+
+def _is_word_char(char: str) -> bool:
+    """Same character class as re's \\w on str"""
+    return char.isalnum() or char == '_'
+
+
+def _find_literals(message: str) -> _LiteralHits:
+    """Find immediacy words, ambiguous phrases and whole-word profanity"""
+    text = message.lower()
+
+    if _LITERAL_AUTOMATON is None:
+        return _LiteralHits(
+            immediate=_IMMEDIATE_RE.search(text) is not None,
+            ambiguous=_AMBIGUOUS_RE.search(text) is not None,
+            profanity=_PROFANITY_WORD_RE.findall(text)
+        )
+
+    immediate = ambiguous = False
+    profanity = []
+    for end, (tag, phrase) in _LITERAL_AUTOMATON.iter(text):
+        if tag == 'immediate':
+            immediate = True
+        elif tag == 'ambiguous':
+            ambiguous = True
+        else:
+            start = end - len(phrase) + 1
+            # Profanity words only count on word boundaries
+            if (start == 0 or not _is_word_char(text[start - 1])) and \
+                    (end + 1 == len(text) or not _is_word_char(text[end + 1])):
+                profanity.append(phrase)
+
+    return _LiteralHits(immediate, ambiguous, profanity)
+
+# Prefilter: one scan over every risk pattern and ambiguous phrase.
+# Most store questions match nothing and skip the per-category checks.
+_RISK_PREFILTER_PATTERNS = (
+    _SELF_HARM_PATTERNS +
+    _HARM_OTHERS_PATTERNS +
+    _DISTRESS_PATTERNS +
+    _PROFANITY_PATTERNS +
+    _WORKPLACE_VIOLENCE_PATTERNS +
+    [re.escape(phrase) for phrase in _AMBIGUOUS_PHRASES]
+)
+
+_RISK_PREFILTER = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern in _RISK_PREFILTER_PATTERNS),
+    re.IGNORECASE
+)
+
+
+def _compile_hyperscan(patterns: List[str]):
+    """
+    Compile patterns into a Hyperscan multi-pattern database.
+
+    Returns None when hyperscan is not installed or cannot compile a pattern.
+    """
+    if hyperscan is None:
+        return None
+
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+    database = hyperscan.Database()
+    try:
+        database.compile(
+            expressions=[pattern.encode() for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flags] * len(patterns)
+        )
+    except hyperscan.error:
+        return None
+    return database
+
+
+# Hyperscan only supports ASCII word boundaries (\b is rejected in Unicode
+# mode), which agree with re on ASCII text; other messages use re
+_HS_RISK_PREFILTER = _compile_hyperscan(_RISK_PREFILTER_PATTERNS)
+
+# Hyperscan scratch space can't be shared between concurrent scans
+_hs_local = threading.local()
+
+
+def _stop_scan(*args) -> bool:
+    """Hyperscan match handler: the first match settles the answer"""
+    return True
+
+
+def _has_risk_indicator(message: str) -> bool:
+    """Return whether any risk pattern or ambiguous phrase occurs in message"""
+    if _HS_RISK_PREFILTER is not None and message.isascii():
+        scratch = getattr(_hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = _hs_local.scratch = hyperscan.Scratch(_HS_RISK_PREFILTER)
+
+        try:
+            _HS_RISK_PREFILTER.scan(message.encode(), match_event_handler=_stop_scan, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+
+    return _RISK_PREFILTER.search(message) is not None
+
+
+def _matched_patterns(compiled: Tuple[re.Pattern, List[re.Pattern]], message: str) -> List[str]:
+    """Return the source of every pattern in a compiled category that matches message"""
+    gate, patterns = compiled
+    if not gate.search(message):
+        return []
+    return [pattern.pattern for pattern in patterns if pattern.search(message)]
 
 
 class SafetyCategory(Enum):
@@ -49,6 +289,114 @@ class SafetyClassification:
     reasoning: str
 
 
+# Gemini model used for semantic analysis of ambiguous messages
+SAFETY_LLM_MODEL = "gemini-2.0-flash-exp"
+
+# Static rubric sent as the Gemini system instruction, so the per-call
+# prompt is just the message and the shared prefix can be cached server-side
+_LLM_CLASSIFIER_INSTRUCTIONS = """You are a safety classifier for an enterprise workplace chatbot.
+
+Analyze each message from a retail employee and classify it into ONE category:
+
+Categories:
+1. safe_operational - Normal work-related question
+2. profanity_only - Contains profanity but no safety risk
+3. emotional_distress - Expressing stress, overwhelm, or emotional difficulty
+4. self_harm_risk - Mentions or implies self-harm ideation
+5. harm_to_others_risk - Threatens or implies harm to others
+6. imminent_danger - Immediate safety risk
+
+Give a confidence between 0.0 and 1.0 and a brief explanation as reasoning.
+
+Be conservative: if uncertain between two categories, choose the more severe one."""
+
+_LLM_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "category": {"type": "string", "enum": [category.value for category in SafetyCategory]},
+        "confidence": {"type": "number"},
+        "reasoning": {"type": "string"}
+    },
+    "required": ["category", "confidence", "reasoning"]
+}
+
+
+# Shared verdict for messages with no safety concerns (cached verdicts are
+# shared between callers too)
+_SAFE_CLASSIFICATION = SafetyClassification(
+    category=SafetyCategory.SAFE_OPERATIONAL,
+    severity=SeverityLevel.LOW,
+    confidence=0.95,
+    detected_patterns=[],
+    requires_escalation=False,
+    reasoning="No safety concerns detected"
+)
+
+
+def _message_digest(message: str) -> bytes:
+    """Cache key for a message's verdict"""
+    return hashlib.blake2b(message.encode("utf-8"), digest_size=16).digest()
+
+
+def _llm_rubric_digest() -> bytes:
+    """Identifies the model, instructions and schema an LLM verdict came from"""
+    rubric = json.dumps(
+        [SAFETY_LLM_MODEL, _LLM_CLASSIFIER_INSTRUCTIONS, _LLM_RESPONSE_SCHEMA], sort_keys=True
+    )
+    return hashlib.blake2b(rubric.encode("utf-8"), digest_size=16).digest()
+
+
+class _LLMVerdictStore:
+    """
+    SQLite table of LLM verdicts keyed by message and rubric.
+
+    LLM calls are the only slow, billed part of classification, so their
+    verdicts outlive the process (the in-memory LRU cache does not). Keys
+    are message digests keyed with the rubric digest, so changing the model
+    or its instructions stops earlier verdicts from being served.
+    """
+
+    def __init__(self, path: str, rubric: bytes):
+        self._rubric = rubric
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts (digest BLOB PRIMARY KEY, verdict TEXT NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def _digest(self, message: str) -> bytes:
+        return hashlib.blake2b(message.encode("utf-8"), digest_size=16, key=self._rubric).digest()
+
+    def get(self, message: str) -> Optional[SafetyClassification]:
+        """Return the stored verdict, or None if this message was never classified under this rubric"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT verdict FROM verdicts WHERE digest = ?", (self._digest(message),)
+            ).fetchone()
+        if row is None:
+            return None
+
+        data = json.loads(row[0])
+        data['category'] = SafetyCategory(data['category'])
+        data['severity'] = SeverityLevel(data['severity'])
+        return SafetyClassification(**data)
+
+    def put(self, message: str, classification: SafetyClassification) -> None:
+        """Store a verdict, replacing any earlier one for the same message"""
+        data = dict(
+            vars(classification),
+            category=classification.category.value,
+            severity=classification.severity.value
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts (digest, verdict) VALUES (?, ?)",
+                (self._digest(message), json.dumps(data))
+            )
+
+
 class SafetyClassifier:
     """
     Classifies incoming messages for safety risks.
@@ -61,57 +409,56 @@ class SafetyClassifier:
     Design principle: Err on the side of safety (conservative classification)
     """
 
-    def __init__(self, project_id: str, use_llm_classification: bool = True):
+    def __init__(
+        self,
+        project_id: str,
+        use_llm_classification: bool = True,
+        cache_size: int = 4096,
+        llm_cache_path: Optional[str] = None
+    ):
         """
         Initialize safety classifier
 
         Args:
             project_id: GCP project ID for Vertex AI
             use_llm_classification: Whether to use LLM for semantic analysis
+            cache_size: Max number of classification results kept in the LRU cache (0 disables)
+            llm_cache_path: SQLite file persisting LLM verdicts across restarts (None disables)
         """
         self.project_id = project_id
         self.use_llm_classification = use_llm_classification
 
+        # LRU cache of verdicts keyed by message digest. The verdict depends
+        # only on the message text, so repeated phrasings skip regex/LLM work.
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, SafetyClassification] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._llm_verdicts = (
+            _LLMVerdictStore(llm_cache_path, _llm_rubric_digest()) if llm_cache_path else None
+        )
+
         # Initialize Vertex AI
         aiplatform.init(project=project_id)
 
-        # Risk pattern dictionaries
-        # NOTE: These are indicators, not definitive classifications
-        # Actual classification requires context analysis
-
-        self._self_harm_patterns = [
-            r'\b(kill myself|end my life|want to die|suicide|hurt myself)\b',
-            r'\b(cut myself|overdose|jump off|hang myself)\b',
-            r'\b(don\'?t want to live|life isn\'?t worth|no reason to live)\b',
-            r'\b(better off dead|can\'?t go on|goodbye world)\b'
-        ]
-
-        self._harm_others_patterns = [
-            r'\b(kill (him|her|them|you|everyone))\b',
-            r'\b(going to hurt|shoot|stab|attack)\b',
-            r'\b(bring a (gun|weapon|knife))\b',
-            r'\b(make them pay|get revenge|teach them a lesson)\b'
-        ]
-
-        self._distress_patterns = [
-            r'\b(can\'?t take it anymore|falling apart|breaking down)\b',
-            r'\b(feel hopeless|feeling worthless|hate myself)\b',
-            r'\b(overwhelming|drowning|suffocating)\b',
-            r'\b(panic attack|anxiety attack|mental breakdown)\b',
-            r'\b(need help|desperate|at my limit)\b'
-        ]
-
-        self._profanity_patterns = [
-            # Basic profanity detection
-            # In production, use a comprehensive profanity filter library
-            r'\b(f[u\*]ck|sh[i\*]t|d[a\*]mn|h[e\*]ll|b[i\*]tch|[a\*]ss)\w*\b',
-            r'\b(bastard|piss|crap)\b'
-        ]
-
-        self._workplace_violence_patterns = [
-            r'\b(active shooter|workplace violence|threatening)\b',
-            r'\b(unsafe work environment|being harassed|sexual harassment)\b'
-        ]
+        # Built once; GenerativeModel holds no per-request state
+        self._llm = GenerativeModel(
+            SAFETY_LLM_MODEL,
+            generation_config=GenerationConfig(
+                temperature=0.1,  # Low temperature for consistent classification
+                max_output_tokens=200,
+                response_mime_type="application/json",
+                response_schema=_LLM_RESPONSE_SCHEMA
+            ),
+            system_instruction=_LLM_CLASSIFIER_INSTRUCTIONS
+        ) if use_llm_classification else None
+
+        # Risk patterns are module-level constants compiled once at import
+        self._self_harm_patterns = _SELF_HARM_PATTERNS
+        self._harm_others_patterns = _HARM_OTHERS_PATTERNS
+        self._distress_patterns = _DISTRESS_PATTERNS
+        self._profanity_patterns = _PROFANITY_PATTERNS
+        self._workplace_violence_patterns = _WORKPLACE_VIOLENCE_PATTERNS
+        self._ambiguous_phrases = _AMBIGUOUS_PHRASES
 
     def classify(self, message: str, context: Optional[Dict] = None) -> SafetyClassification:
         """
@@ -124,68 +471,87 @@ class SafetyClassifier:
         Returns:
             SafetyClassification with category and metadata
         """
-        message_lower = message.lower().strip()
+        # Too short to contain any risk indicator; skip hashing and the cache
+        if len(message) < _MIN_RISK_LENGTH:
+            return self._safe_classification()
+
+        if not self.cache_size:
+            return self._classify_uncached(message)
+
+        key = _message_digest(message)
+
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        classification = self._classify_uncached(message)
+
+        # Don't pin a conservative fallback caused by a transient LLM failure
+        if "llm_error_conservative" not in classification.detected_patterns:
+            with self._cache_lock:
+                self._cache[key] = classification
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return classification
+
+    def _classify_uncached(self, message: str) -> SafetyClassification:
+        """Run the full classification pipeline without consulting the cache"""
+        # Every pattern is case-insensitive, so the message is matched as-is
+
+        # Fast path: no risk indicator anywhere means no check below can fire
+        if not _has_risk_indicator(message):
+            return self._safe_classification()
+
+        # One pass over every literal phrase list
+        literals = _find_literals(message)
 
         # CRITICAL: Check for imminent danger patterns first
-        imminent_check = self._check_imminent_danger(message_lower)
+        imminent_check = self._check_imminent_danger(message, literals)
         if imminent_check:
             return imminent_check
 
         # Check for harm to others
-        harm_others_check = self._check_harm_to_others(message_lower)
+        harm_others_check = self._check_harm_to_others(message)
         if harm_others_check:
             return harm_others_check
 
         # Check for self-harm risk
-        self_harm_check = self._check_self_harm(message_lower)
+        self_harm_check = self._check_self_harm(message)
         if self_harm_check:
             return self_harm_check
 
         # Check for emotional distress
-        distress_check = self._check_emotional_distress(message_lower)
+        distress_check = self._check_emotional_distress(message)
         if distress_check:
             return distress_check
 
         # Check for profanity
-        profanity_check = self._check_profanity(message_lower)
+        profanity_check = self._check_profanity(message, literals)
         if profanity_check:
             return profanity_check
 
         # If using LLM classification, do semantic analysis
-        if self.use_llm_classification and self._needs_semantic_analysis(message_lower):
-            llm_check = self._llm_classify(message)
+        if self.use_llm_classification and self._needs_semantic_analysis(literals):
+            llm_check = self._llm_classify_persisted(message)
             if llm_check.category != SafetyCategory.SAFE_OPERATIONAL:
                 return llm_check
 
         # Default: Safe operational query
-        return SafetyClassification(
-            category=SafetyCategory.SAFE_OPERATIONAL,
-            severity=SeverityLevel.LOW,
-            confidence=0.95,
-            detected_patterns=[],
-            requires_escalation=False,
-            reasoning="No safety concerns detected"
-        )
-
-    def _check_imminent_danger(self, message: str) -> Optional[SafetyClassification]:
-        """Check for imminent danger indicators"""
-        patterns_found = []
-
-        # Combine critical patterns
-        critical_patterns = (
-            self._self_harm_patterns[-2:] +  # Most severe self-harm
-            self._harm_others_patterns[:2]    # Most severe harm to others
-        )
+        return self._safe_classification()
 
-        for pattern in critical_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                patterns_found.append(pattern)
+    def _safe_classification(self) -> SafetyClassification:
+        """Default classification for messages with no safety concerns"""
+        return _SAFE_CLASSIFICATION
 
-        # Check for temporal immediacy words
-        immediate_words = ['right now', 'today', 'tonight', 'going to', 'about to']
-        has_immediacy = any(word in message for word in immediate_words)
+    def _check_imminent_danger(self, message: str, literals: _LiteralHits) -> Optional[SafetyClassification]:
+        """Check for imminent danger indicators"""
+        patterns_found = _matched_patterns(_CRITICAL_RES, message)
 
-        if patterns_found and has_immediacy:
+        # Temporal immediacy words come from the literal scan
+        if patterns_found and literals.immediate:
             return SafetyClassification(
                 category=SafetyCategory.IMMINENT_DANGER,
                 severity=SeverityLevel.CRITICAL,
@@ -199,15 +565,7 @@ class SafetyClassifier:
 
     def _check_harm_to_others(self, message: str) -> Optional[SafetyClassification]:
         """Check for threats or intent to harm others"""
-        patterns_found = []
-
-        for pattern in self._harm_others_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                patterns_found.append(pattern)
-
-        for pattern in self._workplace_violence_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                patterns_found.append(pattern)
+        patterns_found = _matched_patterns(_HARM_OTHERS_RES, message)
 
         if patterns_found:
             return SafetyClassification(
@@ -223,11 +581,7 @@ class SafetyClassifier:
 
     def _check_self_harm(self, message: str) -> Optional[SafetyClassification]:
         """Check for self-harm ideation"""
-        patterns_found = []
-
-        for pattern in self._self_harm_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                patterns_found.append(pattern)
+        patterns_found = _matched_patterns(_SELF_HARM_RES, message)
 
         if patterns_found:
             # Determine severity based on specificity
@@ -246,11 +600,7 @@ class SafetyClassifier:
 
     def _check_emotional_distress(self, message: str) -> Optional[SafetyClassification]:
         """Check for emotional distress signals"""
-        patterns_found = []
-
-        for pattern in self._distress_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                patterns_found.append(pattern)
+        patterns_found = _matched_patterns(_DISTRESS_RES, message)
 
         if patterns_found:
             return SafetyClassification(
@@ -264,14 +614,11 @@ class SafetyClassifier:
 
         return None
 
-    def _check_profanity(self, message: str) -> Optional[SafetyClassification]:
+    def _check_profanity(self, message: str, literals: _LiteralHits) -> Optional[SafetyClassification]:
         """Check for profanity and abusive language"""
-        patterns_found = []
-
-        for pattern in self._profanity_patterns:
-            matches = re.findall(pattern, message, re.IGNORECASE)
-            if matches:
-                patterns_found.extend(matches)
+        # The pattern captures the word stem; report it lowercased
+        patterns_found = [match.lower() for match in _PROFANITY_STEM_RE.findall(message)]
+        patterns_found.extend(literals.profanity)
 
         if patterns_found:
             return SafetyClassification(
@@ -285,7 +632,7 @@ class SafetyClassifier:
 
         return None
 
-    def _needs_semantic_analysis(self, message: str) -> bool:
+    def _needs_semantic_analysis(self, literals: _LiteralHits) -> bool:
         """
         Determine if message needs LLM semantic analysis
 
@@ -295,12 +642,23 @@ class SafetyClassifier:
         - Context-dependent meaning
         """
         # Indicators that semantic analysis might be needed
-        ambiguous_phrases = [
-            'can\'t take', 'had enough', 'done with this',
-            'over it', 'breaking point', 'last straw'
-        ]
+        return literals.ambiguous
+
+    def _llm_classify_persisted(self, message: str) -> SafetyClassification:
+        """_llm_classify, reusing verdicts stored by earlier processes"""
+        if self._llm_verdicts is None:
+            return self._llm_classify(message)
 
-        return any(phrase in message for phrase in ambiguous_phrases)
+        stored = self._llm_verdicts.get(message)
+        if stored is not None:
+            return stored
+
+        classification = self._llm_classify(message)
+        # Only actual model verdicts are kept; the conservative error
+        # fallback and the inconclusive default are retried next time
+        if "llm_semantic_analysis" in classification.detected_patterns:
+            self._llm_verdicts.put(message, classification)
+        return classification
 
     def _llm_classify(self, message: str) -> SafetyClassification:
         """
@@ -310,48 +668,15 @@ class SafetyClassifier:
         pattern matching alone is insufficient.
         """
         try:
-            model = GenerativeModel("gemini-2.0-flash-exp")
-
-            classification_prompt = f"""You are a safety classifier for an enterprise workplace chatbot.
-
-Analyze this message from a retail employee and classify it into ONE category:
-
-Categories:
-1. SAFE_OPERATIONAL - Normal work-related question
-2. PROFANITY_ONLY - Contains profanity but no safety risk
-3. EMOTIONAL_DISTRESS - Expressing stress, overwhelm, or emotional difficulty
-4. SELF_HARM_RISK - Mentions or implies self-harm ideation
-5. HARM_TO_OTHERS_RISK - Threatens or implies harm to others
-6. IMMINENT_DANGER - Immediate safety risk
-
-Message: "{message}"
-
-Respond in this exact format:
-CATEGORY: [category]
-CONFIDENCE: [0.0-1.0]
-REASONING: [brief explanation]
-
-Be conservative: if uncertain between two categories, choose the more severe one."""
-
-            response = model.generate_content(
-                classification_prompt,
-                generation_config={
-                    "temperature": 0.1,  # Low temperature for consistent classification
-                    "max_output_tokens": 200
-                }
-            )
-
-            result_text = response.text.strip()
+            response = self._llm.generate_content(f'Message: "{message}"')
 
-            # Parse LLM response
-            category_match = re.search(r'CATEGORY:\s*(\w+)', result_text)
-            confidence_match = re.search(r'CONFIDENCE:\s*([\d.]+)', result_text)
-            reasoning_match = re.search(r'REASONING:\s*(.+)', result_text, re.DOTALL)
+            # Structured output: a JSON object matching _LLM_RESPONSE_SCHEMA
+            result = json.loads(response.text)
+            category_str = result.get('category')
 
-            if category_match:
-                category_str = category_match.group(1).lower()
-                confidence = float(confidence_match.group(1)) if confidence_match else 0.7
-                reasoning = reasoning_match.group(1).strip() if reasoning_match else "LLM classification"
+            if category_str:
+                confidence = float(result.get('confidence', 0.7))
+                reasoning = result.get('reasoning') or "LLM classification"
 
                 # Map to SafetyCategory enum
                 category_map = {
@@ -363,7 +688,7 @@ Be conservative: if uncertain between two categories, choose the more severe one
                     'imminent_danger': SafetyCategory.IMMINENT_DANGER
                 }
 
-                category = category_map.get(category_str, SafetyCategory.SAFE_OPERATIONAL)
+                category = category_map.get(category_str.lower(), SafetyCategory.SAFE_OPERATIONAL)
 
                 # Determine severity and escalation
                 severity_map = {
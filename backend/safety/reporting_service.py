@@ -111,7 +111,8 @@ class ConfidentialReportingService:
         message: str,
         classification: Dict,
         policy_response: Dict,
-        context: Optional[Dict] = None
+        context: Optional[Dict] = None,
+        report_id: Optional[str] = None
     ) -> str:
         """
         Submit a confidential safety report
@@ -122,12 +123,14 @@ class ConfidentialReportingService:
             classification: SafetyClassification data
             policy_response: SafetyResponse data
             context: Additional context (store_id, device_id, etc.)
+            report_id: Pre-generated report ID (see generate_report_id), so the
+                caller can reference the report before it is stored
 
         Returns:
             report_id: Unique identifier for this report
         """
         # Generate report ID
-        report_id = f"SAFE-{uuid.uuid4().hex[:12].upper()}"
+        report_id = report_id or self.generate_report_id()
 
         # Anonymize user ID (one-way hash)
         anonymized_user_id = self._anonymize_user_id(user_id)
@@ -182,6 +185,11 @@ class ConfidentialReportingService:
 
         return report_id
 
+    @staticmethod
+    def generate_report_id() -> str:
+        """Generate a unique confidential report ID"""
+        return f"SAFE-{uuid.uuid4().hex[:12].upper()}"
+
     def _anonymize_user_id(self, user_id: str) -> str:
         """
         Create one-way hash of user ID
@@ -35,6 +35,9 @@ class InfrastructureSecurityGuard:
     3. Logs potential security probing attempts
     """
 
+    # Confidence contributed by each matching pattern
+    _PATTERN_CONFIDENCE = 0.3
+
     def __init__(self):
         """Initialize infrastructure security guard"""
 
@@ -74,6 +77,12 @@ class InfrastructureSecurityGuard:
             for pattern in self._infrastructure_patterns
         ]
 
+        # Single alternation of all patterns: one scan answers "does anything match?"
+        self._combined_pattern = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self._infrastructure_patterns),
+            re.IGNORECASE
+        )
+
         # Standard compliant response
         self._standard_response = (
             "This system operates within Macy's secure cloud environment, "
@@ -101,7 +110,7 @@ class InfrastructureSecurityGuard:
 
         # Calculate confidence based on number of matches
         is_infrastructure_query = len(detected_patterns) > 0
-        confidence = min(len(detected_patterns) * 0.3, 1.0)
+        confidence = min(len(detected_patterns) * self._PATTERN_CONFIDENCE, 1.0)
 
         # Sanitize question by removing infrastructure terms
         sanitized = self._sanitize_question(question)
@@ -157,5 +166,10 @@ class InfrastructureSecurityGuard:
         Returns:
             True if question should be blocked and replaced with standard response
         """
+        # A single match already reaches the threshold: one combined scan
+        # decides without per-pattern searches or sanitization
+        if threshold <= self._PATTERN_CONFIDENCE:
+            return self._combined_pattern.search(question) is not None
+
         result = self.check_question(question)
         return result.is_infrastructure_query and result.confidence >= threshold
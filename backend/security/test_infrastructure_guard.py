@@ -126,6 +126,20 @@ class TestInfrastructureSecurityGuard:
         if result.confidence < 0.9:
             assert not guard.should_block(question, threshold=0.95)
 
+    def test_fast_path_matches_full_check(self, guard):
+        """Test that the combined-pattern fast path agrees with check_question"""
+        questions = [
+            "How do I process a return?",
+            "Where is this hosted?",
+            "What are the store hours?",
+            "Tell me about your backend infrastructure",
+            "Is this on kubernetes?",
+        ]
+
+        for question in questions:
+            result = guard.check_question(question)
+            assert guard.should_block(question) == result.is_infrastructure_query, question
+
 
 if __name__ == "__main__":
     # Quick manual test
@@ -5,4 +5,5 @@ This serves the FastAPI backend API.
 from backend.api.main import app
 
 # The app is already defined in backend.api.main
-# App Engine will use this as the entry point
+# App Engine will use this as the entry point. This module only re-exports
+# it, so the RAG and safety singletons are still constructed exactly once.
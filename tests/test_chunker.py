@@ -4,22 +4,44 @@ from backend.ingestion.chunkers import Chunker
 from pathlib import Path
 
 
-# Parsing Document
-processor = DocumentProcessor(
-    Path(r"D:\WORKSPACE\Macy_Chatbot\Macy's KB articles\all_docs\ELSKiosk_Issue.docx")
-)
+def test_sentence_chunker_windows_with_overlap():
+    chunker = Chunker(embedder=None, chunk_size=40, overlap=30)
+    text = "Returns take 30 days. Exchanges take 60 days. Gift cards never expire."
 
-document_text = list(processor.document_dict.values())[0]
+    chunks = chunker.sentence_chunker(text)
 
-print(f"Loaded document characters: {len(document_text)}")
+    assert chunks == [
+        "Returns take 30 days. Exchanges take 60 days.",
+        "Exchanges take 60 days. Gift cards never expire.",
+    ]
 
-# Intializing Embedding Model
-embedder = SentenceTransformerEmbedder()
 
-# Intializing Semantic Chunker
-chunker = Chunker(embedder)
+def test_sentence_chunker_without_sentence_terminators():
+    chunker = Chunker(embedder=None, chunk_size=40, overlap=20)
+    text = "\n".join(f"SKU {i} aisle {i % 7}" for i in range(50))
 
-chunks = chunker.semantic_chunker(document_text)
+    chunks = chunker.sentence_chunker(text)
 
-for i, chunk in enumerate(chunks):
-    print(f"\nChunk {i}:\n{chunk}\n{'-'*80}")
\ No newline at end of file
+    assert chunks == [text]
+
+
+if __name__ == "__main__":
+    # Parsing Document
+    processor = DocumentProcessor(
+        Path(r"D:\WORKSPACE\Macy_Chatbot\Macy's KB articles\all_docs\ELSKiosk_Issue.docx")
+    )
+
+    document_text = list(processor.document_dict.values())[0]
+
+    print(f"Loaded document characters: {len(document_text)}")
+
+    # Intializing Embedding Model
+    embedder = SentenceTransformerEmbedder()
+
+    # Intializing Semantic Chunker
+    chunker = Chunker(embedder)
+
+    chunks = chunker.semantic_chunker(document_text)
+
+    for i, chunk in enumerate(chunks):
+        print(f"\nChunk {i}:\n{chunk}\n{'-'*80}")
@@ -0,0 +1,76 @@
+"""
+Unit Tests for RAGOrchestrator
+
+Tests how generated and failed answers are returned and cached.
+
+Run with: pytest tests/test_orchestrator.py -v
+"""
+
+import pytest
+from unittest.mock import patch
+from backend.llm.vertex import LLMGenerationError
+from backend.rag.orchestrator import RAGOrchestrator
+
+
+class TestRAGOrchestrator:
+    """Test RAGOrchestrator.ask with stubbed models and stores"""
+
+    @pytest.fixture
+    def rag(self):
+        """Create an orchestrator whose models, stores and LLM are mocks"""
+        with patch('backend.rag.orchestrator.SentenceTransformerEmbedder'), \
+             patch('backend.rag.orchestrator.Chunker'), \
+             patch('backend.rag.orchestrator.ChromaVectorStore'), \
+             patch('backend.rag.orchestrator.BM25Store'), \
+             patch('backend.rag.orchestrator.HybridSearch'), \
+             patch('backend.rag.orchestrator.Reranker'), \
+             patch('backend.rag.orchestrator.VertexLLM'):
+            rag = RAGOrchestrator(project_id="test-project")
+
+        rag.embedder.embed.return_value = [[1.0, 0.0, 0.0]]
+        rag.hybrid.search.return_value = [
+            {"text": "Returns are accepted within 30 days.", "meta": {"source": "returns.docx"}}
+        ]
+        return rag
+
+    def test_answer_is_returned(self, rag):
+        """Test that a generated answer is returned with its citations"""
+        rag.llm.generate.return_value = "Within 30 days [1]."
+
+        response = rag.ask("What is the return policy?")
+
+        assert response["answer"] == "Within 30 days [1]."
+        assert response["generation_failed"] is False
+        assert response["citations"][0]["source"] == "returns.docx"
+
+    def test_failed_generation_is_flagged(self, rag):
+        """Test that a Vertex timeout is shown as the answer but flagged"""
+        rag.llm.generate.side_effect = LLMGenerationError("ERROR: Vertex AI request timed out.")
+
+        response = rag.ask("What is the return policy?")
+
+        assert response["answer"] == "ERROR: Vertex AI request timed out."
+        assert response["generation_failed"] is True
+
+    def test_failed_generation_is_not_cached(self, rag):
+        """Test that the next ask retries Vertex instead of serving the error"""
+        rag.llm.generate.side_effect = LLMGenerationError("ERROR: Vertex AI request timed out.")
+        rag.ask("What is the return policy?")
+
+        rag.llm.generate.side_effect = None
+        rag.llm.generate.return_value = "Within 30 days [1]."
+        response = rag.ask("What is the return policy?")
+
+        assert response["answer"] == "Within 30 days [1]."
+        assert len(rag.semantic_cache) == 1
+
+    def test_cached_answer_scoped_by_store_and_language(self, rag):
+        """Test that a cached answer is reused only for the same store and language"""
+        rag.llm.generate.return_value = "Within 30 days [1]."
+        rag.ask("What is the return policy?", "NY_001", "en")
+        rag.ask("What is the return policy?", "NY_001", "en")
+        assert rag.llm.generate.call_count == 1
+
+        rag.ask("What is the return policy?", "NY_001", "es")
+        rag.ask("What is the return policy?", "SF_002", "en")
+        assert rag.llm.generate.call_count == 3
@@ -31,7 +31,7 @@ class TestSafetyClassifier:
     @pytest.fixture
     def classifier(self):
         """Create classifier without LLM for faster tests"""
-        with patch('backend.safety.classifier.genai') as mock_genai:
+        with patch('backend.safety.classifier.aiplatform') as mock_genai:
             classifier = SafetyClassifier(
                 project_id="test-project",
                 use_llm_classification=False
@@ -181,6 +181,80 @@ class TestSafetyClassifier:
         assert any('self' in pattern.lower() or 'harm' in pattern.lower()
                   for pattern in classification.detected_patterns)
 
+    def test_repeated_message_served_from_cache(self, classifier):
+        """Test that repeated messages reuse the cached classification"""
+        first = classifier.classify("How do I process a return?")
+
+        with patch.object(classifier, '_classify_uncached') as mock_classify:
+            second = classifier.classify("How do I process a return?")
+            mock_classify.assert_not_called()
+
+        assert second is first
+
+    def test_llm_verdict_persisted_across_instances(self, tmp_path):
+        """Test that a stored LLM verdict is reused by a new classifier"""
+        cache_path = str(tmp_path / "llm_verdicts.sqlite")
+        verdict = SafetyClassification(
+            category=SafetyCategory.EMOTIONAL_DISTRESS,
+            severity=SeverityLevel.MEDIUM,
+            confidence=0.8,
+            detected_patterns=["llm_semantic_analysis"],
+            requires_escalation=True,
+            reasoning="LLM Analysis: frustrated with shift"
+        )
+
+        first = SafetyClassifier(project_id="test-project", llm_cache_path=cache_path)
+        with patch.object(first, '_llm_classify', return_value=verdict):
+            first.classify("I've had enough of this shift")
+
+        second = SafetyClassifier(project_id="test-project", llm_cache_path=cache_path)
+        with patch.object(second, '_llm_classify') as mock_llm:
+            assert second.classify("I've had enough of this shift") == verdict
+            mock_llm.assert_not_called()
+
+    def test_llm_verdict_not_reused_after_model_change(self, tmp_path):
+        """Test that stored verdicts are keyed by the model that produced them"""
+        cache_path = str(tmp_path / "llm_verdicts.sqlite")
+        verdict = SafetyClassification(
+            category=SafetyCategory.SAFE_OPERATIONAL,
+            severity=SeverityLevel.LOW,
+            confidence=0.9,
+            detected_patterns=["llm_semantic_analysis"],
+            requires_escalation=False,
+            reasoning="LLM Analysis: venting about the shift"
+        )
+
+        first = SafetyClassifier(project_id="test-project", llm_cache_path=cache_path)
+        with patch.object(first, '_llm_classify', return_value=verdict):
+            first.classify("I've had enough of this shift")
+
+        with patch('backend.safety.classifier.SAFETY_LLM_MODEL', "gemini-next"):
+            second = SafetyClassifier(project_id="test-project", llm_cache_path=cache_path)
+        with patch.object(second, '_llm_classify', return_value=verdict) as mock_llm:
+            second.classify("I've had enough of this shift")
+            mock_llm.assert_called_once()
+
+    def test_inconclusive_llm_verdict_not_persisted(self, tmp_path):
+        """Test that the inconclusive SAFE fallback is retried, not stored"""
+        cache_path = str(tmp_path / "llm_verdicts.sqlite")
+        inconclusive = SafetyClassification(
+            category=SafetyCategory.SAFE_OPERATIONAL,
+            severity=SeverityLevel.LOW,
+            confidence=0.6,
+            detected_patterns=[],
+            requires_escalation=False,
+            reasoning="LLM classification inconclusive"
+        )
+
+        first = SafetyClassifier(project_id="test-project", llm_cache_path=cache_path)
+        with patch.object(first, '_llm_classify', return_value=inconclusive):
+            first.classify("I've had enough of this shift")
+
+        second = SafetyClassifier(project_id="test-project", llm_cache_path=cache_path)
+        with patch.object(second, '_llm_classify', return_value=inconclusive) as mock_llm:
+            second.classify("I've had enough of this shift")
+            mock_llm.assert_called_once()
+
 
 class TestSafetyPolicyEngine:
     """Test SafetyPolicyEngine response generation"""
@@ -380,7 +454,7 @@ class TestIntegration:
     @pytest.fixture
     def safety_pipeline(self):
         """Create full safety pipeline (without actual GCP services)"""
-        with patch('backend.safety.classifier.genai'):
+        with patch('backend.safety.classifier.aiplatform'):
             classifier = SafetyClassifier(
                 project_id="test-project",
                 use_llm_classification=False
@@ -0,0 +1,42 @@
+"""
+Unit Tests for VertexLLM
+
+Tests that failed generations raise LLMGenerationError.
+
+Run with: pytest tests/test_vertex_llm.py -v
+"""
+
+import pytest
+from unittest.mock import patch
+from google.api_core import exceptions
+from backend.llm.vertex import VertexLLM, LLMGenerationError
+
+
+class TestVertexLLM:
+    """Test VertexLLM.generate error handling with a mocked model"""
+
+    @pytest.fixture
+    def llm(self):
+        """Create a VertexLLM that believes it has credentials"""
+        with patch('backend.llm.vertex.google.auth.default'), \
+             patch('backend.llm.vertex.vertexai'), \
+             patch('backend.llm.vertex.GenerativeModel'):
+            return VertexLLM(project_id="test-project")
+
+    def test_permission_denied_raises_with_fallback(self, llm):
+        """Test that a 403 shows the context fallback but still counts as a failure"""
+        llm.model.generate_content.side_effect = exceptions.GoogleAPIError(
+            "403 IAM_PERMISSION_DENIED"
+        )
+
+        with pytest.raises(LLMGenerationError) as excinfo:
+            llm.generate("Sources:\n[1] Returns within 30 days.\n\nQuestion: Return policy?\n")
+
+        assert "Returns within 30 days." in str(excinfo.value)
+
+    def test_api_error_raises(self, llm):
+        """Test that other API errors raise LLMGenerationError"""
+        llm.model.generate_content.side_effect = exceptions.GoogleAPIError("500 internal")
+
+        with pytest.raises(LLMGenerationError, match="Vertex AI request failed"):
+            llm.generate("Question: Return policy?")
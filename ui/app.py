@@ -11,6 +11,17 @@ try:
 except Exception:
     API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
 
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Process-wide HTTP session so backend calls reuse keep-alive connections"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+http = get_http_session()
+
 # Generate session ID for tracking
 if 'session_id' not in st.session_state:
     st.session_state.session_id = str(uuid.uuid4())
@@ -69,7 +80,7 @@ st.sidebar.markdown("""
 
 # Fetch and display safety features status
 try:
-    health_response = requests.get(f"{API_URL}/health", timeout=5)
+    health_response = http.get(f"{API_URL}/health", timeout=5)
     if health_response.status_code == 200:
         health_data = health_response.json()
         st.session_state.safety_features = health_data.get("safety_features", {})
@@ -120,7 +131,7 @@ if st.sidebar.button("Ingest Files"):
                         tmp.write(file.read())
                         tmp_path = tmp.name
 
-                    response = requests.post(
+                    response = http.post(
                         f"{API_URL}/ingest",
                         files={"file": open(tmp_path, "rb")},
                         data={"store_id": store_id},
@@ -160,7 +171,7 @@ st.sidebar.markdown("---")
 with st.sidebar.expander("📊 Feedback Statistics"):
     if st.button("Refresh Stats", key="refresh_stats"):
         try:
-            stats_response = requests.get(f"{API_URL}/feedback/stats")
+            stats_response = http.get(f"{API_URL}/feedback/stats")
             if stats_response.status_code == 200:
                 stats_data = stats_response.json()
                 if stats_data.get("status") == "success":
@@ -242,7 +253,7 @@ if st.button("Ask"):
 
     with st.spinner("Analyzing knowledge base..."):
         try:
-            response = requests.post(
+            response = http.post(
                 f"{API_URL}/ask",
                 json={"question": question, "store_id": store_id},
                 timeout=30
@@ -462,7 +473,7 @@ if st.button("Ask"):
         }
 
         try:
-            feedback_response = requests.post(f"{API_URL}/feedback", json=feedback_data)
+            feedback_response = http.post(f"{API_URL}/feedback", json=feedback_data)
 
             if feedback_response.status_code == 200:
                 result = feedback_response.json()